@@ -0,0 +1,218 @@
+# Benchmark pipeline ingest -> normalisasi -> clustering -> render -> export
+# pada data sintetis berskema migrasi_kota_bekasi.csv.
+#
+#   python benchmarks/bench_pipeline.py --scales 10000 100000 1000000
+#   python benchmarks/bench_pipeline.py --compare bench_results_lama.json
+#
+# Setiap tahap diukur terpisah: waktu (perf_counter) dan puncak alokasi
+# memori (tracemalloc, pada eksekusi terpisah). Hasil ditulis sebagai JSON agar bisa dibandingkan
+# antar versi.
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt
+import plotly.express as px
+import sklearn
+from sklearn.cluster import KMeans
+
+from migrasi.clustering import K_RANGE, elbow_sweep, fit_kmeans, resolve_engine
+from migrasi.data import DATASET_PATH, KELUAR_COL, KELURAHAN_COL, MASUK_COL
+from migrasi.figures import render_diverging_bar
+from migrasi.incremental import warm_start_update
+from migrasi.ingest import read_columns_chunked
+from migrasi.large_data import downsample_rows, scatter_figure, top_n_per_cluster
+from migrasi.pipeline import label_frame
+from migrasi.preprocessing import normalize_minmax
+
+DEFAULT_SCALES = [10_000, 100_000, 1_000_000]
+DEFAULT_OUTPUT = 'bench_results.json'
+NUM_CLUSTERS = 3
+# Tinggi bar chart = jumlah baris / 2 inci, jadi hanya sebagian baris yang dirender
+BAR_CHART_ROWS = 100
+TRACE_MEMORY = True
+
+
+def make_dataset(n_rows, seed=0):
+    # Sampel ulang pasangan (masuk, keluar) dari data Kota Bekasi dengan noise
+    base = pd.read_csv(DATASET_PATH)
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(base), n_rows)
+    noise = rng.normal(1.0, 0.1, (n_rows, 2)).clip(0.5, 1.5)
+    values = (base[[MASUK_COL, KELUAR_COL]].to_numpy()[picks] * noise).round().astype(np.int64)
+    return pd.DataFrame({
+        KELURAHAN_COL: [f'KELURAHAN {i}' for i in range(n_rows)],
+        MASUK_COL: values[:, 0],
+        KELUAR_COL: values[:, 1],
+    })
+
+
+def measure(records, n_rows, name, func, **extra):
+    # Waktu diukur tanpa tracemalloc (overhead-nya besar untuk kode Python
+    # murni seperti Matplotlib); puncak memori diukur pada eksekusi kedua.
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+    peak_mb = None
+    if TRACE_MEMORY:
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_mb = round(peak / 2**20, 3)
+    records.append(dict(rows=n_rows, stage=name, seconds=round(seconds, 6), peak_mb=peak_mb, **extra))
+    memory = f"{peak_mb:>9.1f} MB" if peak_mb is not None else ''
+    print(f"{n_rows:>10,}  {name:<22} {seconds:>9.3f} s  {memory}", file=sys.stderr)
+    return result
+
+
+def bench_scale(n_rows, workdir):
+    records = []
+    csv_path = os.path.join(workdir, f'migrasi_{n_rows}.csv')
+    make_dataset(n_rows).to_csv(csv_path, index=False)
+    columns = [MASUK_COL, KELUAR_COL]
+
+    measure(records, n_rows, 'read_csv', lambda: pd.read_csv(csv_path))
+
+    def read_chunked():
+        with open(csv_path, 'rb') as f:
+            return read_columns_chunked(f, KELURAHAN_COL, columns)
+    df = measure(records, n_rows, 'read_csv_chunked', read_chunked)
+
+    scaler, X_normalized = measure(records, n_rows, 'normalize_minmax', lambda: normalize_minmax(df, columns))
+
+    engine = resolve_engine('auto', len(X_normalized))
+    measure(records, n_rows, 'elbow_sweep', lambda: elbow_sweep(X_normalized, K_RANGE, engine), engine=engine)
+    # Pembanding: k yang sama difit berurutan dengan seluruh core untuk setiap fit
+    measure(records, n_rows, 'elbow_sweep_serial', lambda: elbow_sweep(X_normalized, K_RANGE, engine, max_workers=1),
+            engine=engine)
+    kmeans = measure(records, n_rows, 'kmeans_fit', lambda: fit_kmeans(X_normalized, NUM_CLUSTERS, engine),
+                     engine=engine)
+    # Pembaruan inkremental (0,01% baris berubah) dibanding fit ulang penuh
+    # dari centroid lama. Pembaruan kedua memakai margin dari pembaruan pertama.
+    rng = np.random.default_rng(1)
+    changed = rng.choice(n_rows, max(1, n_rows // 10_000), replace=False)
+    X_updated = X_normalized.copy()
+    X_updated[changed] = rng.random((len(changed), X_updated.shape[1]))
+    updated, _, _ = measure(records, n_rows, 'warm_start_update', lambda: warm_start_update(
+        X_updated, kmeans.labels_, kmeans.cluster_centers_, changed))
+    measure(records, n_rows, 'warm_start_update_margins', lambda: warm_start_update(
+        X_updated, updated.labels_, updated.cluster_centers_, changed, updated.margins_))
+    measure(records, n_rows, 'kmeans_warm_refit', lambda: KMeans(
+        NUM_CLUSTERS, init=kmeans.cluster_centers_, n_init=1, tol=0).fit(X_updated))
+    result = measure(records, n_rows, 'label_frame',
+                     lambda: label_frame(df, KELURAHAN_COL, MASUK_COL, KELUAR_COL, scaler, kmeans))
+
+    centroids = scaler.inverse_transform(kmeans.cluster_centers_)
+
+    def mpl_scatter():
+        fig, ax = plt.subplots(figsize=(10, 5))
+        ax.scatter(df[MASUK_COL], df[KELUAR_COL], c=kmeans.labels_, cmap='rainbow', alpha=0.7)
+        fig.savefig(io.BytesIO(), format='png', dpi=200)
+        plt.close(fig)
+    measure(records, n_rows, 'mpl_scatter', mpl_scatter)
+
+    bar_rows = min(n_rows, BAR_CHART_ROWS)
+    bar_df = df.head(bar_rows).set_index(KELURAHAN_COL).sort_values(MASUK_COL, ascending=False)
+    measure(records, n_rows, 'mpl_diverging_bar', lambda: render_diverging_bar(bar_df), rendered_rows=bar_rows)
+
+    def plotly_payload(build):
+        return lambda: len(build().to_json())
+
+    payload = measure(records, n_rows, 'plotly_scatter', plotly_payload(lambda: scatter_figure(
+        df[MASUK_COL], df[KELUAR_COL], kmeans.labels_, centroids, NUM_CLUSTERS, MASUK_COL, KELUAR_COL)))
+    records[-1]['payload_bytes'] = payload
+
+    treemap_df = result.assign(cluster=result['cluster'].astype(str))
+    payload = measure(records, n_rows, 'plotly_treemap', plotly_payload(lambda: px.treemap(
+        top_n_per_cluster(treemap_df, 'Kelurahan', ['Migrasi_Masuk', 'Migrasi_Keluar']),
+        path=['cluster', 'Kelurahan'], values='jumlah')))
+    records[-1]['payload_bytes'] = payload
+
+    area_df = downsample_rows(result).melt(
+        id_vars=['Kelurahan', 'cluster', 'keterangan'], value_vars=['Migrasi_Masuk', 'Migrasi_Keluar'],
+        var_name='Jenis Migrasi', value_name='Jumlah Migrasi')
+    payload = measure(records, n_rows, 'plotly_area', plotly_payload(lambda: px.area(
+        area_df, x='Kelurahan', y='Jumlah Migrasi', color='Jenis Migrasi')))
+    records[-1]['payload_bytes'] = payload
+
+    measure(records, n_rows, 'to_csv', lambda: result.to_csv(os.path.join(workdir, 'out.csv'), index=False))
+    os.remove(csv_path)
+    return records
+
+
+def metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'git_commit': commit or None,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'cpu_count': os.cpu_count(),
+        'platform': platform.platform(),
+    }
+
+
+def compare(current, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    old = {(r['rows'], r['stage']): r for r in baseline['results']}
+    print(f"{'rows':>10}  {'stage':<22} {'lama':>9} {'baru':>9} {'rasio':>7}")
+    for record in current['results']:
+        before = old.get((record['rows'], record['stage']))
+        if before is None:
+            continue
+        ratio = record['seconds'] / before['seconds'] if before['seconds'] else float('nan')
+        print(f"{record['rows']:>10,}  {record['stage']:<22} {before['seconds']:>9.3f} "
+              f"{record['seconds']:>9.3f} {ratio:>7.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark pipeline clustering migrasi per tahap.")
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES, help="Jumlah baris sintetis")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="File JSON hasil benchmark")
+    parser.add_argument('--compare', help="File JSON hasil benchmark sebelumnya untuk dibandingkan")
+    parser.add_argument('--no-memory', action='store_true', help="Lewati pengukuran memori (tracemalloc)")
+    args = parser.parse_args(argv)
+
+    global TRACE_MEMORY
+    TRACE_MEMORY = not args.no_memory
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for n_rows in args.scales:
+            results.extend(bench_scale(n_rows, workdir))
+
+    report = {'meta': metadata(), 'results': results}
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Hasil ditulis ke {args.output}", file=sys.stderr)
+    if args.compare:
+        compare(report, args.compare)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
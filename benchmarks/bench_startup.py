@@ -0,0 +1,125 @@
+# Benchmark waktu start aplikasi Streamlit per halaman menu.
+#
+#   python benchmarks/bench_startup.py
+#   python benchmarks/bench_startup.py --pages Deskripsi Home --reruns 10
+#   python benchmarks/bench_startup.py --compare bench_results_startup_lama.json
+#
+# Setiap halaman diukur di proses Python baru (AppTest, tanpa browser):
+# - cold_start: impor streamlit + rerun pertama halaman tersebut, yaitu
+#   waktu sampai halaman pertama kali selesai dirender di proses baru;
+# - first_run: rerun pertama saja (termasuk impor modul halaman);
+# - rerun: median waktu rerun berikutnya dengan session_state yang sama.
+# Modul berat yang sudah termuat setelah rerun pertama ikut dicatat untuk
+# memastikan halaman ringan tidak memuat pandas/scikit-learn/matplotlib.
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, 'migrasi-cluster.py')
+DEFAULT_PAGES = ["Deskripsi", "Home", "Unggah Data", "Preprocessing", "Clustering", "Visualisasi"]
+DEFAULT_OUTPUT = 'bench_results_startup.json'
+HEAVY_MODULES = ('numpy', 'pandas', 'pyarrow', 'sklearn', 'matplotlib', 'seaborn', 'plotly')
+
+# Dijalankan di proses anak agar setiap pengukuran mulai dari impor kosong
+CHILD = '''
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app_path, menu, reruns, heavy = sys.argv[1], sys.argv[2], int(sys.argv[3]), sys.argv[4].split(',')
+at = AppTest.from_file(app_path, default_timeout=300)
+at.session_state['menu'] = menu
+first = time.perf_counter()
+at.run()
+end = time.perf_counter()
+loaded = [name for name in heavy if name in sys.modules]
+reruns_s = []
+for _ in range(reruns):
+    t = time.perf_counter()
+    at.run()
+    reruns_s.append(time.perf_counter() - t)
+print(json.dumps({
+    'cold_start': end - start, 'first_run': end - first, 'reruns': reruns_s,
+    'heavy_modules': loaded, 'exceptions': [e.value for e in at.exception],
+}))
+'''
+
+
+def bench_page(menu, reruns):
+    env = dict(os.environ, MIGRASI_DIAGNOSTICS='0')
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-c', CHILD, APP_PATH, menu, str(reruns), ','.join(HEAVY_MODULES)],
+        capture_output=True, text=True, cwd=ROOT, env=env, check=True,
+    )
+    process_seconds = time.perf_counter() - start
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    rerun_values = sorted(result.pop('reruns'))
+    result.update({
+        'page': menu,
+        'process': process_seconds,
+        'rerun': rerun_values[len(rerun_values) // 2] if rerun_values else None,
+    })
+    rerun = f"{result['rerun'] * 1000:>8.0f} ms" if result['rerun'] is not None else f"{'-':>11}"
+    print(f"{menu:<20} {result['cold_start']:>8.3f} s {result['first_run'] * 1000:>8.0f} ms {rerun}  "
+          f"{','.join(result['heavy_modules']) or '-'}", file=sys.stderr)
+    return result
+
+
+def metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=ROOT).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'git_commit': commit or None,
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'platform': platform.platform(),
+    }
+
+
+def compare(current, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    old = {r['page']: r for r in baseline['results']}
+    print(f"{'page':<20} {'stage':<11} {'lama':>9} {'baru':>9} {'rasio':>7}")
+    for record in current['results']:
+        before = old.get(record['page'])
+        if before is None:
+            continue
+        for stage in ('cold_start', 'first_run', 'rerun'):
+            if not before.get(stage) or record.get(stage) is None:
+                continue
+            print(f"{record['page']:<20} {stage:<11} {before[stage]:>9.3f} {record[stage]:>9.3f} "
+                  f"{record[stage] / before[stage]:>7.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark waktu start dan rerun per halaman aplikasi.")
+    parser.add_argument('--pages', nargs='+', default=DEFAULT_PAGES, help="Nama menu yang diukur")
+    parser.add_argument('--reruns', type=int, default=5, help="Jumlah rerun hangat per halaman")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="File JSON hasil benchmark")
+    parser.add_argument('--compare', help="File JSON hasil benchmark sebelumnya untuk dibandingkan")
+    args = parser.parse_args(argv)
+
+    print(f"{'page':<20} {'cold_start':>10} {'first_run':>11} {'rerun':>11}  modul berat", file=sys.stderr)
+    results = [bench_page(menu, args.reruns) for menu in args.pages]
+
+    report = {'meta': metadata(), 'results': results}
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Hasil ditulis ke {args.output}", file=sys.stderr)
+    if args.compare:
+        compare(report, args.compare)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,2 @@
+# Paket pendukung aplikasi migrasi-cluster.py: logika yang tidak bergantung
+# pada Streamlit sehingga bisa dipakai ulang dan diimpor secara terpisah.
@@ -0,0 +1,82 @@
+import argparse
+import os
+import sys
+import time
+
+from migrasi.clustering import ENGINE_AUTO, ENGINE_EXACT, ENGINE_MINIBATCH
+from migrasi.data import KELUAR_COL, KELURAHAN_COL, MASUK_COL
+from migrasi.pipeline import DEFAULT_CLUSTERS, output_paths, run_many
+from migrasi.scoring import score_csv
+
+STAGES = ['read', 'normalize', 'elbow', 'cluster', 'label', 'write']
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m migrasi',
+        description="Clustering migrasi penduduk tanpa Streamlit untuk banyak file CSV sekaligus.",
+    )
+    parser.add_argument('inputs', nargs='+', help="File CSV input (mis. satu file per kota/kabupaten)")
+    parser.add_argument('-o', '--output-dir', default='.', help="Direktori keluaran (default: direktori kerja)")
+    parser.add_argument('-k', '--clusters', type=int, default=DEFAULT_CLUSTERS, help="Jumlah cluster")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="Jumlah proses paralel (default: jumlah core)")
+    parser.add_argument('--engine', choices=[ENGINE_AUTO, ENGINE_EXACT, ENGINE_MINIBATCH], default=ENGINE_AUTO,
+                        help="minibatch: out-of-core lewat np.memmap, untuk file lebih besar dari RAM")
+    parser.add_argument('--elbow', action='store_true', help="Hitung juga Elbow Method untuk k=1..10")
+    parser.add_argument('--kelurahan-col', default=KELURAHAN_COL)
+    parser.add_argument('--masuk-col', default=MASUK_COL)
+    parser.add_argument('--keluar-col', default=KELUAR_COL)
+    parser.add_argument('--model', metavar='RUN_ID',
+                        help="Beri cluster memakai model tersimpan (model_store) tanpa fit ulang")
+    args = parser.parse_args(argv)
+    try:
+        output_paths(args.inputs, args.output_dir)
+    except ValueError as error:
+        parser.error(str(error))
+    return args
+
+
+def print_report(results, elapsed):
+    header = ['file', 'rows'] + STAGES + ['inertia']
+    print('\t'.join(header))
+    for result in results:
+        timings = result['timings']
+        row = [result['output'], str(result['n_rows'])]
+        row += [f"{timings[name]:.3f}" if name in timings else '-' for name in STAGES]
+        row.append(f"{result['inertia']:.4f}")
+        print('\t'.join(row))
+    print(f"Total: {len(results)} file dalam {elapsed:.3f} detik", file=sys.stderr)
+
+
+def score_many(args):
+    # Scoring per file dengan centroid model tersimpan; file dibaca per chunk
+    os.makedirs(args.output_dir, exist_ok=True)
+    print('\t'.join(['file', 'rows', 'seconds', 'clusters']))
+    for input_path, output_path in zip(args.inputs, output_paths(args.inputs, args.output_dir)):
+        start = time.perf_counter()
+        counts = score_csv(input_path, output_path, args.model)
+        clusters = ', '.join(f"{label}: {count}" for label, count in sorted(counts.items()))
+        print('\t'.join([output_path, str(sum(counts.values())), f"{time.perf_counter() - start:.3f}", clusters]))
+    return 0
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.model:
+        return score_many(args)
+    start = time.perf_counter()
+    results = run_many(
+        args.inputs, args.output_dir, jobs=args.jobs,
+        num_clusters=args.clusters, kelurahan_col=args.kelurahan_col, masuk_col=args.masuk_col,
+        keluar_col=args.keluar_col, engine=args.engine, elbow=args.elbow,
+    )
+    print_report(results, time.perf_counter() - start)
+    for result in results:
+        if result['inertias']:
+            inertias = ', '.join(f"{k}: {v:.4f}" for k, v in result['inertias'].items())
+            print(f"Elbow {result['input']}: {inertias}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,275 @@
+import hashlib
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import CancelledError, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+
+import numpy as np
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import davies_bouldin_score, silhouette_score
+from threadpoolctl import ThreadpoolController
+
+RANDOM_STATE = 42
+K_RANGE = range(1, 11)
+
+# Engine clustering: exact (KMeans penuh) untuk data kecil, mini-batch
+# (partial_fit per chunk) untuk data besar atau yang tidak muat di RAM
+ENGINE_AUTO = 'auto'
+ENGINE_EXACT = 'exact'
+ENGINE_MINIBATCH = 'minibatch'
+MINIBATCH_THRESHOLD_ROWS = 200_000
+CHUNK_SIZE = 100_000
+BATCH_SIZE = 4096
+N_EPOCHS = 3
+
+# Pemilihan k otomatis pada sampel yang diperbesar bertahap (dua kali lipat)
+# sampai rekomendasi stabil di dua putaran berturut-turut
+AUTO_K_RANGE = range(2, 11)
+SAMPLE_START = 2_000
+SAMPLE_MAX = 64_000
+SILHOUETTE_SAMPLE = 5_000
+
+# Jatah core per proses untuk semua fit KMeans (semua sesi, job, dan thread
+# elbow sweep). Setiap fit memesan sejumlah core, menunggu giliran (FIFO)
+# bila jatah habis, dan thread OpenMP-nya dibatasi ke jumlah itu, sehingga
+# total thread tidak melebihi jumlah core berapa pun job yang berjalan.
+_cores = threading.Condition()
+_cores_waiting = deque()
+_cores_used = 0
+_cores_total = os.cpu_count() or 1
+# Daftar pustaka OpenMP dipindai sekali; threadpool_limits() memindai ulang setiap kali (~10 ms)
+_threadpools = ThreadpoolController()
+
+
+def array_hash(X):
+    # Hash isi array (beserta shape dan dtype) untuk kunci cache
+    X = np.ascontiguousarray(X)
+    h = hashlib.sha1()
+    h.update(str((X.shape, X.dtype.str)).encode())
+    h.update(X.tobytes())
+    return h.hexdigest()
+
+
+def resolve_engine(engine, n_rows):
+    if engine == ENGINE_AUTO:
+        return ENGINE_MINIBATCH if n_rows > MINIBATCH_THRESHOLD_ROWS else ENGINE_EXACT
+    return engine
+
+
+def array_chunks(X, chunk_size=CHUNK_SIZE):
+    # Sumber chunk yang bisa diiterasi berulang kali (satu kali per epoch)
+    return lambda: (X[start:start + chunk_size] for start in range(0, len(X), chunk_size))
+
+
+def check_cancelled(cancel_event):
+    if cancel_event is not None and cancel_event.is_set():
+        raise CancelledError()
+
+
+def process_context():
+    # Proses pekerja tidak boleh dibuat dengan fork: pemanggil (mis. thread job
+    # Streamlit) sudah multi-thread dan sudah menjalankan OpenMP lewat KMeans,
+    # sehingga proses hasil fork bisa deadlock. forkserver memulai pekerja dari
+    # proses bersih; spawn dipakai di platform tanpa forkserver (Windows).
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def core_budget():
+    return _cores_total
+
+
+def set_core_budget(n):
+    # Dipanggil di proses pekerja yang hanya mendapat sebagian core mesin
+    global _cores_total
+    with _cores:
+        _cores_total = max(1, int(n))
+        _cores.notify_all()
+
+
+@contextmanager
+def reserve_cores(n=None, cancel_event=None):
+    global _cores_used
+    with _cores:
+        n = min(n or _cores_total, _cores_total)
+        ticket = object()
+        _cores_waiting.append(ticket)
+        try:
+            while _cores_waiting[0] is not ticket or _cores_used + n > _cores_total:
+                check_cancelled(cancel_event)
+                _cores.wait(0.1)
+            _cores_used += n
+        finally:
+            _cores_waiting.remove(ticket)
+            _cores.notify_all()
+    try:
+        # Batas OpenMP berlaku per thread pemanggil, jadi aman di thread pool
+        with _threadpools.limit(limits=n, user_api='openmp'):
+            yield n
+    finally:
+        with _cores:
+            _cores_used -= n
+            _cores.notify_all()
+
+
+def fit_minibatch_kmeans(chunks, k, n_epochs=N_EPOCHS, batch_size=BATCH_SIZE, cancel_event=None):
+    # chunks adalah callable yang mengembalikan iterator chunk baru, misalnya
+    # dari np.memmap atau pembacaan CSV per chunk, sehingga data tidak perlu
+    # dimuat seluruhnya ke memori
+    kmeans = MiniBatchKMeans(n_clusters=k, random_state=RANDOM_STATE, batch_size=batch_size)
+    for _ in range(n_epochs):
+        for chunk in chunks():
+            check_cancelled(cancel_event)
+            for start in range(0, len(chunk), batch_size):
+                kmeans.partial_fit(chunk[start:start + batch_size])
+
+    # Label dan inertia dihitung atas seluruh data agar sebanding dengan KMeans exact
+    labels, inertia = [], 0.0
+    for chunk in chunks():
+        labels.append(kmeans.predict(chunk))
+        inertia -= kmeans.score(chunk)
+    kmeans.labels_ = np.concatenate(labels)
+    kmeans.inertia_ = inertia
+    return kmeans
+
+
+def fit_kmeans(X, k, engine=ENGINE_EXACT, cancel_event=None, threads=None):
+    # threads: jumlah core yang dipesan dari jatah proses (default seluruh jatah)
+    check_cancelled(cancel_event)
+    with reserve_cores(threads, cancel_event):
+        if engine == ENGINE_MINIBATCH:
+            return fit_minibatch_kmeans(array_chunks(X), k, cancel_event=cancel_event)
+        kmeans = KMeans(n_clusters=k, random_state=RANDOM_STATE)
+        kmeans.fit(X)
+        return kmeans
+
+
+def elbow_sweep(X, k_range=K_RANGE, engine=ENGINE_EXACT, max_workers=None, progress=None, cancel_event=None):
+    # Fit model untuk setiap k secara paralel. KMeans melepas GIL di loop
+    # Cython-nya, jadi thread pool cukup dan tidak perlu mem-pickle data.
+    # Setiap fit mendapat jatah_core // max_workers thread OpenMP agar thread
+    # pool dan OpenMP tidak saling berebut core. progress(fraksi) dipanggil
+    # setiap satu k selesai; cancel_event menghentikan fit yang belum dimulai.
+    k_range = list(k_range)
+    if max_workers is None:
+        max_workers = min(len(k_range), core_budget())
+    threads = max(1, core_budget() // max_workers)
+    models = {}
+    if max_workers == 1:
+        # Satu core: tanpa thread pool, fit berurutan dengan seluruh jatah core
+        for k in k_range:
+            models[k] = fit_kmeans(X, k, engine, cancel_event, threads)
+            if progress is not None:
+                progress(len(models) / len(k_range))
+        return models
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(fit_kmeans, X, k, engine, cancel_event, threads): k for k in k_range}
+        try:
+            for future in as_completed(futures):
+                models[futures[future]] = future.result()
+                if progress is not None:
+                    progress(len(models) / len(k_range))
+        except CancelledError:
+            for future in futures:
+                future.cancel()
+            raise
+    return {k: models[k] for k in k_range}
+
+
+KETERANGAN_NAIK = 'Peningkatan'
+KETERANGAN_TURUN = 'Penurunan'
+
+
+def describe_clusters(centroids_denorm, labels):
+    # Keterangan per cluster: "Peningkatan" bila total migrasi centroid
+    # (skala asli) di atas rata-rata seluruh kelurahan, selain itu "Penurunan"
+    totals = np.asarray(centroids_denorm).sum(axis=1)
+    counts = np.bincount(np.asarray(labels), minlength=len(totals))
+    overall = (totals * counts).sum() / max(counts.sum(), 1)
+    return np.where(totals > overall, KETERANGAN_NAIK, KETERANGAN_TURUN)
+
+
+def knee_scores(k_values, inertias):
+    # Kneedle: selisih kurva inertia ternormalisasi terhadap garis lurus
+    # dari titik pertama ke titik terakhir; knee = selisih terbesar
+    k_values = np.asarray(k_values, dtype=np.float64)
+    inertias = np.asarray(inertias, dtype=np.float64)
+    x = (k_values - k_values[0]) / max(k_values[-1] - k_values[0], 1)
+    span = inertias.max() - inertias.min()
+    y = (inertias - inertias.min()) / span if span > 0 else np.zeros_like(inertias)
+    return (1 - x) - y
+
+
+def score_k(X, k_range=AUTO_K_RANGE, cancel_event=None):
+    # Inertia (k=1..max), silhouette, Davies-Bouldin, dan skor knee per k
+    k_range = list(k_range)
+    all_k = list(range(1, max(k_range) + 1))
+    if len(X) <= max(k_range):
+        raise ValueError(
+            f"Pemilihan k otomatis membutuhkan lebih dari {max(k_range)} baris data (tersedia {len(X)})."
+        )
+    models = elbow_sweep(X, all_k, cancel_event=cancel_event)
+    inertias = [float(models[k].inertia_) for k in all_k]
+    knee = dict(zip(all_k, knee_scores(all_k, inertias)))
+    metrics = []
+    for k in k_range:
+        labels = models[k].labels_
+        # Silhouette hanya terdefinisi untuk 2..n-1 label berbeda
+        if not 2 <= len(np.unique(labels)) < len(X):
+            continue
+        metrics.append({
+            'k': k,
+            'inertia': inertias[k - 1],
+            'silhouette': float(silhouette_score(
+                X, labels, sample_size=min(len(X), SILHOUETTE_SAMPLE), random_state=RANDOM_STATE
+            )),
+            'davies_bouldin': float(davies_bouldin_score(X, labels)),
+            'knee': float(knee[k]),
+        })
+    return metrics, dict(zip(all_k, inertias))
+
+
+def recommend_k(metrics):
+    # Rata-rata peringkat dari ketiga metrik; seri dimenangkan k terkecil
+    if not metrics:
+        raise ValueError(
+            "Tidak ada k yang menghasilkan minimal dua cluster berbeda; "
+            "data terlalu seragam untuk pemilihan k otomatis."
+        )
+    ks = np.array([m['k'] for m in metrics])
+    ranks = np.zeros(len(metrics))
+    for name, higher_is_better in (('silhouette', True), ('davies_bouldin', False), ('knee', True)):
+        values = np.array([m[name] for m in metrics])
+        order = np.argsort(-values if higher_is_better else values, kind='stable')
+        ranks[order] += np.arange(len(values))
+    return int(ks[np.lexsort((ks, ranks))[0]])
+
+
+def select_k(X, k_range=AUTO_K_RANGE, start=SAMPLE_START, max_sample=SAMPLE_MAX, progress=None, cancel_event=None):
+    # Sampel bersarang (prefix dari satu permutasi) agar tiap putaran
+    # memperluas sampel sebelumnya
+    n_rows = len(X)
+    order = np.random.default_rng(RANDOM_STATE).permutation(n_rows)
+    limit = min(n_rows, max_sample)
+    size = min(start, limit)
+    rounds, previous = [], None
+    while True:
+        sample = X[np.sort(order[:size])]
+        metrics, inertias = score_k(sample, k_range, cancel_event)
+        k = recommend_k(metrics)
+        rounds.append({'sample_size': size, 'k': k})
+        if progress is not None:
+            progress(size / limit)
+        if k == previous or size >= limit:
+            break
+        previous = k
+        size = min(size * 2, limit)
+    return {
+        'k': k,
+        'sample_size': size,
+        'rounds': rounds,
+        'metrics': metrics,
+        'inertias': inertias,
+    }
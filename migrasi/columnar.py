@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import pandas as pd
+import pyarrow as pa
+
+from migrasi.paths import BASE_DIR
+
+# Cache dataset unggahan dalam format kolumnar Arrow IPC (tanpa kompresi).
+# Setiap file dikonversi sekali, disimpan dengan nama = hash isinya, lalu
+# dibuka lewat memory map: kolom numerik dipakai langsung dari page cache OS
+# tanpa disalin, sehingga beberapa sesi yang menganalisis file yang sama
+# berbagi halaman memori yang sama. Bila total ukuran cache melebihi
+# MAX_CACHE_BYTES, file yang paling lama tidak dibuka dihapus (LRU).
+CACHE_DIR = os.environ.get('MIGRASI_CACHE_DIR', os.path.join(BASE_DIR, 'data_cache'))
+MAX_CACHE_BYTES = int(os.environ.get('MIGRASI_CACHE_MAX_MB', 2048)) * 1024 * 1024
+CACHE_SUFFIX = '.arrow'
+HASH_BLOCK = 8 * 1024 * 1024
+
+
+def content_hash(buffer):
+    # Hash isi file per blok agar isi buffer tidak disalin utuh sekali lagi
+    buffer.seek(0)
+    digest = hashlib.sha1()
+    while block := buffer.read(HASH_BLOCK):
+        digest.update(block)
+    buffer.seek(0)
+    return digest.hexdigest()
+
+
+def cache_key(data_hash, columns=None):
+    # Tanpa columns: seluruh file; dengan columns: hanya kolom terpilih (mode streaming)
+    if columns is None:
+        return data_hash
+    key = json.dumps([data_hash, list(columns)])
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def _cache_path(key):
+    return os.path.join(CACHE_DIR, key + CACHE_SUFFIX)
+
+
+def save_columnar(key, df):
+    # Satu record batch per file agar setiap kolom bisa dibaca zero-copy.
+    # Tulis ke file sementara lalu rename agar pembaca tidak melihat file setengah jadi.
+    path = _cache_path(key)
+    if os.path.exists(path):
+        return path
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False).combine_chunks()
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, prefix='.tmp-', suffix=CACHE_SUFFIX)
+    os.close(fd)
+    try:
+        with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    prune_cache(keep=key)
+    return path
+
+
+def prune_cache(max_bytes=None, keep=None):
+    # Waktu modifikasi diperbarui setiap kali file dibuka (open_columnar),
+    # jadi file terlama menurut mtime adalah yang paling lama tidak dipakai.
+    # Sesi yang masih memetakan file yang dihapus tetap bisa membacanya.
+    if not os.path.isdir(CACHE_DIR):
+        return
+    max_bytes = MAX_CACHE_BYTES if max_bytes is None else max_bytes
+    entries = []
+    for entry in os.scandir(CACHE_DIR):
+        if entry.name.endswith(CACHE_SUFFIX) and not entry.name.startswith('.'):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.name))
+    total = 0
+    for _, size, name in sorted(entries, reverse=True):
+        total += size
+        if total > max_bytes and name != f'{keep}{CACHE_SUFFIX}':
+            try:
+                os.remove(os.path.join(CACHE_DIR, name))
+            except OSError:
+                # Sudah dihapus sesi lain, atau masih dipetakan (Windows)
+                pass
+
+
+def _column_to_pandas(column):
+    array = column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+    if pa.types.is_dictionary(array.type):
+        # Kolom nama: kode kategori dipakai langsung, hanya kamusnya yang disalin
+        return pd.Categorical.from_codes(
+            array.indices.to_numpy(zero_copy_only=False),
+            array.dictionary.to_pandas(),
+        )
+    # Tanpa nilai kosong, to_numpy tidak menyalin (array read-only di atas memory map)
+    return array.to_numpy(zero_copy_only=False)
+
+
+def open_columnar(key):
+    path = _cache_path(key)
+    try:
+        os.utime(path)
+        table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+    except FileNotFoundError:
+        return None
+    columns = {name: _column_to_pandas(table.column(name)) for name in table.column_names}
+    # copy=False: setiap kolom tetap menjadi blok sendiri di atas memory map
+    return pd.DataFrame(columns, copy=False)
@@ -0,0 +1,95 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from migrasi.paths import CLUSTER_PATH, DATASET_PATH, IMAGE_PATH
+
+# File dibaca sekali per proses dan dibagikan ke semua sesi. Setiap sesi
+# menerima salinannya sendiri (tanpa bergantung pada opsi global pandas
+# seperti copy-on-write) sehingga perubahan oleh satu sesi tidak pernah
+# mengubah data di cache.
+_lock = threading.RLock()
+_cache = {}
+
+
+def _load(path, loader, key=None):
+    # Muat file sekali per proses, muat ulang hanya bila mtime berubah.
+    # key membedakan beberapa turunan (mis. indeks) dari file yang sama.
+    cache_key = (path, key)
+    mtime = os.path.getmtime(path)
+    with _lock:
+        entry = _cache.get(cache_key)
+        if entry is None or entry[0] != mtime:
+            entry = (mtime, loader(path))
+            _cache[cache_key] = entry
+    return entry[1]
+
+
+def _read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def load_csv(path):
+    return _load(path, pd.read_csv).copy()
+
+
+def load_bytes(path):
+    return _load(path, _read_bytes)
+
+
+def load_dataset():
+    return load_csv(DATASET_PATH)
+
+
+def load_cluster_output():
+    return load_csv(CLUSTER_PATH)
+
+
+def load_image():
+    return load_bytes(IMAGE_PATH)
+
+
+KELURAHAN_COL = 'nama_desa_kelurahan'
+MASUK_COL = 'total_migrasi_masuk'
+KELUAR_COL = 'total_migrasi_keluar'
+
+
+class DatasetIndex:
+    # Struktur lookup yang dibangun sekali per versi dataset: indeks
+    # nama -> posisi baris, urutan terurut per kolom, dan total kolom.
+    # Semua frame yang dikembalikan berupa salinan (indeks posisi selalu menyalin).
+
+    def __init__(self, df, version=None):
+        self._df = df
+        self.version = version
+        self._indexed = df.set_index(KELURAHAN_COL)
+        self.names = df[KELURAHAN_COL].drop_duplicates().tolist()
+        self._positions = df.groupby(KELURAHAN_COL, sort=False).indices
+        self._orders = {
+            col: np.argsort(-df[col].to_numpy(), kind='stable')
+            for col in (MASUK_COL, KELUAR_COL)
+        }
+        self._totals = df[[MASUK_COL, KELUAR_COL]].sum()
+
+    def rows(self, name):
+        return self._df.iloc[self._positions[name]]
+
+    def sorted_by(self, column):
+        return self._indexed.iloc[self._orders[column]]
+
+    def totals(self):
+        return self._totals.copy()
+
+
+def _build_dataset_index(path):
+    df = _load(path, pd.read_csv)
+    if not {KELURAHAN_COL, MASUK_COL, KELUAR_COL}.issubset(df.columns):
+        return None
+    return DatasetIndex(df, version=os.path.getmtime(path))
+
+
+def load_dataset_index():
+    return _load(DATASET_PATH, _build_dataset_index, key='index')
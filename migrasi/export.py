@@ -0,0 +1,167 @@
+import gzip
+import importlib.util
+import io
+import tempfile
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Ekspor hasil clustering per chunk ke SpooledTemporaryFile: file kecil tetap
+# di memori, file besar otomatis pindah ke disk. Hasil ekspor disimpan (LRU)
+# dengan kunci run_id + format, sehingga unduhan berikutnya untuk run yang
+# sama tidak menulis ulang dan tidak perlu meng-hash seluruh frame.
+FORMAT_CSV = 'csv'
+FORMAT_CSV_GZ = 'csv.gz'
+FORMAT_PARQUET = 'parquet'
+FORMAT_EXCEL = 'xlsx'
+
+FORMATS = {
+    FORMAT_CSV: ("CSV", 'text/csv'),
+    FORMAT_CSV_GZ: ("CSV terkompresi (gzip)", 'application/gzip'),
+    FORMAT_PARQUET: ("Parquet", 'application/vnd.apache.parquet'),
+    FORMAT_EXCEL: ("Excel", 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
+
+CHUNK_ROWS = 100_000
+SPOOL_MAX_BYTES = 32 * 1024 * 1024
+EXCEL_MAX_ROWS = 1_048_575  # batas baris Excel dikurangi satu baris header
+MAX_ENTRIES = 8
+
+_lock = threading.Lock()
+_cache = OrderedDict()
+
+
+def excel_engine():
+    # Excel opsional: butuh xlsxwriter (mode memori konstan) atau openpyxl
+    for engine in ('xlsxwriter', 'openpyxl'):
+        if importlib.util.find_spec(engine) is not None:
+            return engine
+    return None
+
+
+def available_formats(n_rows):
+    formats = [FORMAT_CSV, FORMAT_CSV_GZ, FORMAT_PARQUET]
+    if excel_engine() is not None and n_rows <= EXCEL_MAX_ROWS:
+        formats.append(FORMAT_EXCEL)
+    return formats
+
+
+def row_chunks(df, chunk_rows=CHUNK_ROWS):
+    for start in range(0, len(df), chunk_rows):
+        yield start, df.iloc[start:start + chunk_rows]
+
+
+def _write_csv(df, sink, chunk_rows):
+    text = io.TextIOWrapper(sink, encoding='utf-8', newline='')
+    try:
+        if len(df) == 0:
+            df.to_csv(text, index=False)
+        for start, chunk in row_chunks(df, chunk_rows):
+            chunk.to_csv(text, index=False, header=start == 0)
+        text.flush()
+    finally:
+        # Lepas wrapper tanpa menutup file di bawahnya
+        text.detach()
+
+
+def _write_parquet(df, sink, chunk_rows):
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(sink, schema) as writer:
+        # Setiap chunk menjadi satu row group
+        for _, chunk in row_chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+        if len(df) == 0:
+            writer.write_table(schema.empty_table())
+
+
+def _excel_rows(chunk):
+    # Nilai kosong (NaN/NA) menjadi sel kosong, sama seperti to_excel
+    values = chunk.astype(object).where(chunk.notna(), None)
+    return values.itertuples(index=False, name=None)
+
+
+def _write_excel(df, sink, chunk_rows):
+    engine = excel_engine()
+    if engine is None:
+        raise ValueError("Ekspor Excel membutuhkan paket xlsxwriter atau openpyxl.")
+    if len(df) > EXCEL_MAX_ROWS:
+        raise ValueError(f"Excel hanya menampung {EXCEL_MAX_ROWS:,} baris data.")
+    if engine == 'openpyxl':
+        with pd.ExcelWriter(sink, engine=engine) as writer:
+            if len(df) == 0:
+                df.to_excel(writer, index=False)
+            for start, chunk in row_chunks(df, chunk_rows):
+                # Baris 0 adalah header, chunk berikutnya ditulis tepat di bawahnya
+                chunk.to_excel(
+                    writer, index=False, header=start == 0,
+                    startrow=0 if start == 0 else start + 1,
+                )
+        return
+    # Mode constant_memory xlsxwriter langsung menulis setiap baris ke disk dan
+    # membuang sel yang ditulis ke baris yang sudah lewat. to_excel menulis per
+    # kolom (sel hilang), jadi data ditulis sendiri baris demi baris.
+    import xlsxwriter
+    workbook = xlsxwriter.Workbook(sink, {'constant_memory': True})
+    try:
+        sheet = workbook.add_worksheet()
+        header = workbook.add_format({'bold': True, 'border': 1, 'align': 'center'})
+        sheet.write_row(0, 0, [str(col) for col in df.columns], header)
+        for start, chunk in row_chunks(df, chunk_rows):
+            for offset, values in enumerate(_excel_rows(chunk)):
+                sheet.write_row(start + offset + 1, 0, values)
+    finally:
+        workbook.close()
+
+
+def write_export(df, fmt, chunk_rows=CHUNK_ROWS):
+    sink = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    try:
+        if fmt == FORMAT_CSV:
+            _write_csv(df, sink, chunk_rows)
+        elif fmt == FORMAT_CSV_GZ:
+            with gzip.GzipFile(fileobj=sink, mode='wb', compresslevel=6) as compressed:
+                _write_csv(df, compressed, chunk_rows)
+        elif fmt == FORMAT_PARQUET:
+            _write_parquet(df, sink, chunk_rows)
+        elif fmt == FORMAT_EXCEL:
+            _write_excel(df, sink, chunk_rows)
+        else:
+            raise ValueError(f"Format ekspor tidak dikenal: {fmt}")
+    except BaseException:
+        sink.close()
+        raise
+    sink.seek(0)
+    return sink
+
+
+def export_bytes(df, fmt, run_id=None):
+    # Tanpa run_id (data belum di-cluster) hasil ekspor tidak disimpan di cache
+    if run_id is None:
+        with write_export(df, fmt) as sink:
+            return sink.read()
+    key = (run_id, fmt)
+    with _lock:
+        sink = _cache.get(key)
+        if sink is not None:
+            _cache.move_to_end(key)
+            sink.seek(0)
+            return sink.read()
+    sink = write_export(df, fmt)
+    with _lock:
+        if key in _cache:
+            sink.close()
+            sink = _cache[key]
+        else:
+            _cache[key] = sink
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)[1].close()
+        sink.seek(0)
+        return sink.read()
+
+
+def export_file_name(fmt, base="hasil_clustering"):
+    return f"{base}.{fmt}"
@@ -0,0 +1,132 @@
+import re
+
+import numpy as np
+import pandas as pd
+from sklearn.decomposition import PCA
+
+from migrasi.clustering import RANDOM_STATE
+
+# Fitur turunan untuk clustering multi-fitur. Setiap fitur turunan ditulis
+# sebagai tuple (jenis, kolom_a, kolom_b) dan disimpan di frame sebagai kolom
+# baru dengan nama yang mengodekan spesifikasinya, sehingga frame_hash,
+# penyimpanan run, dan ekspor memperlakukannya seperti kolom biasa.
+DERIVED_NET = 'neto'      # a - b
+DERIVED_RATE = 'laju'     # a / b * RATE_PER (mis. per 1.000 penduduk)
+DERIVED_DELTA = 'delta'   # b - a (tahun a ke tahun b)
+DERIVED_SHARE = 'porsi'   # a / jumlah kolom dalam grup b (rincian jenis kelamin/umur)
+
+RATE_PER = 1000
+YEAR_PATTERN = re.compile(r'^(?P<prefix>.*?)[_\s-]?(?P<year>(19|20)\d{2})$')
+DERIVED_PATTERN = re.compile(rf'^({DERIVED_NET}|{DERIVED_RATE}|{DERIVED_DELTA}|{DERIVED_SHARE})\[')
+
+
+def feature_name(spec):
+    kind, a, b = spec
+    if kind == DERIVED_SHARE:
+        b = '+'.join(b)
+    return f"{kind}[{a}, {b}]"
+
+
+def is_derived(column):
+    return bool(DERIVED_PATTERN.match(str(column)))
+
+
+def year_series(columns):
+    # Kelompokkan kolom bersufiks tahun, mis. migrasi_masuk_2021 -> {'migrasi_masuk': [(2021, kolom), ...]}
+    series = {}
+    for col in columns:
+        match = YEAR_PATTERN.match(str(col))
+        if match:
+            series.setdefault(match['prefix'], []).append((int(match['year']), col))
+    return {prefix: sorted(items) for prefix, items in series.items() if len(items) > 1}
+
+
+def yoy_specs(columns):
+    # Selisih tahun ke tahun untuk setiap deret kolom bertahun
+    return [
+        (DERIVED_DELTA, previous, current)
+        for items in year_series(columns).values()
+        for (_, previous), (_, current) in zip(items, items[1:])
+    ]
+
+
+def share_specs(group):
+    group = tuple(group)
+    return [(DERIVED_SHARE, col, group) for col in group] if len(group) > 1 else []
+
+
+def derived_inputs(derived):
+    # Kolom asli yang dibutuhkan untuk menghitung fitur turunan
+    inputs = []
+    for kind, a, b in derived:
+        inputs.append(a)
+        inputs.extend(b if kind == DERIVED_SHARE else [b])
+    return list(dict.fromkeys(inputs))
+
+
+def _safe_divide(numerator, denominator):
+    out = np.zeros_like(numerator)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out
+
+
+def derived_values(df, derived):
+    # Semua kolom masukan diambil sekali sebagai satu matriks float64,
+    # lalu setiap fitur dihitung dengan operasi kolom NumPy (tanpa loop baris)
+    inputs = derived_inputs(derived)
+    values = df[inputs].to_numpy(dtype=np.float64)
+    index = {col: i for i, col in enumerate(inputs)}
+    group_totals = {}
+
+    out = np.empty((len(df), len(derived)), dtype=np.float64)
+    for j, (kind, a, b) in enumerate(derived):
+        left = values[:, index[a]]
+        if kind == DERIVED_NET:
+            out[:, j] = left - values[:, index[b]]
+        elif kind == DERIVED_RATE:
+            out[:, j] = _safe_divide(left, values[:, index[b]]) * RATE_PER
+        elif kind == DERIVED_DELTA:
+            out[:, j] = values[:, index[b]] - left
+        elif kind == DERIVED_SHARE:
+            if b not in group_totals:
+                group_totals[b] = values[:, [index[col] for col in b]].sum(axis=1)
+            out[:, j] = _safe_divide(left, group_totals[b])
+        else:
+            raise ValueError(f"Jenis fitur turunan tidak dikenal: {kind}")
+    return out
+
+
+def add_features(df, base_columns, derived=()):
+    # Kembalikan frame dengan kolom fitur turunan dan daftar kolom fitur.
+    # Kolom turunan lama yang tidak lagi dipilih dibuang dari frame.
+    derived = list(dict.fromkeys(derived))
+    names = [feature_name(spec) for spec in derived]
+    stale = [col for col in df.columns if is_derived(col) and col not in names]
+    if stale:
+        df = df.drop(columns=stale)
+    if derived:
+        df = df.assign(**dict(zip(names, derived_values(df, derived).T)))
+    return df, list(dict.fromkeys([*base_columns, *names]))
+
+
+def project_2d(X, centers, reduced=False):
+    # Proyeksi ke dua komponen utama teratas untuk scatter plot. Bila X sudah
+    # hasil PCA, komponen sudah berurutan menurut variansnya.
+    X = np.asarray(X)
+    centers = np.asarray(centers)
+    if reduced or X.shape[1] <= 2:
+        return X[:, :2], centers[:, :2]
+    pca = PCA(n_components=2, random_state=RANDOM_STATE).fit(X)
+    return pca.transform(X), pca.transform(centers)
+
+
+def numeric_columns(df):
+    return [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col]) and not is_derived(col)]
+
+
+def derived_from_params(derived):
+    # Spesifikasi dari params.json (list) kembali menjadi tuple yang bisa di-hash
+    return [
+        (kind, a, tuple(b) if kind == DERIVED_SHARE else b)
+        for kind, a, b in derived or []
+    ]
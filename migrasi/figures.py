@@ -0,0 +1,86 @@
+import io
+import threading
+from collections import OrderedDict
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+# Cache PNG hasil render (LRU) agar grafik statis hanya dirender sekali
+# per versi dataset. Figure selalu ditutup setelah disimpan ke bytes.
+MAX_ENTRIES = 64
+DPI = 200
+
+_lock = threading.Lock()
+_cache = OrderedDict()
+
+
+def cached_render(key, render):
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    png = render()
+    with _lock:
+        _cache[key] = png
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return png
+
+
+def to_png(fig):
+    buf = io.BytesIO()
+    try:
+        fig.savefig(buf, format='png', dpi=DPI, bbox_inches='tight')
+    finally:
+        plt.close(fig)
+    return buf.getvalue()
+
+
+def render_heatmap(data_kelurahan, kelurahan):
+    fig, ax = plt.subplots(figsize=(5, 2))
+    sns.heatmap(
+        data_kelurahan.iloc[:, 1:],
+        annot=True,
+        fmt="d",
+        cmap="coolwarm",
+        cbar_kws={"label": "Jumlah Migrasi"},
+        ax=ax
+    )
+    ax.set_title(f"Distribusi Migrasi - {kelurahan}")
+    return to_png(fig)
+
+
+def render_diverging_bar(dfmgr_sorted):
+    masuk = dfmgr_sorted['total_migrasi_masuk']
+    keluar = dfmgr_sorted['total_migrasi_keluar']
+
+    # Menentukan ukuran figure dan axis
+    fig, ax = plt.subplots(figsize=(10, len(dfmgr_sorted) / 2))
+
+    # Membuat bar chart horizontal
+    bars_masuk = ax.barh(dfmgr_sorted.index, masuk, color='#6a0dad', label='Migrasi Masuk')
+    bars_keluar = ax.barh(dfmgr_sorted.index, -keluar, color='#d8a7d0', label='Migrasi Keluar')
+
+    # Menambahkan angka di tengah bar dalam satu panggilan per seri
+    ax.bar_label(bars_masuk, labels=masuk.astype(str), label_type='center', fontsize=10, color='white')
+    ax.bar_label(bars_keluar, labels=keluar.astype(str), label_type='center', fontsize=10, color='black')
+
+    # Menyesuaikan label sumbu
+    ax.set_xlabel("Jumlah Migrasi", fontsize=12)
+    ax.set_ylabel("Kelurahan", fontsize=12)
+
+    # Menambahkan garis vertikal untuk sumbu nol
+    ax.axvline(0, color='black', linewidth=0.8)
+    ax.legend()
+    return to_png(fig)
+
+
+def render_pie(total_masuk, total_keluar):
+    fig, ax = plt.subplots(figsize=(4, 4))
+    ax.pie([total_masuk, total_keluar], labels=['Migrasi_Masuk', 'Migrasi_Keluar'], autopct='%1.1f%%', startangle=90)
+    return to_png(fig)
@@ -0,0 +1,158 @@
+import hashlib
+import os
+from concurrent.futures import CancelledError, ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans
+from sklearn.preprocessing import MinMaxScaler
+from threadpoolctl import threadpool_limits
+
+from migrasi.clustering import (
+    ENGINE_AUTO, RANDOM_STATE, check_cancelled, describe_clusters, fit_kmeans, process_context, resolve_engine,
+    set_core_budget,
+)
+from migrasi.preprocessing import frame_hash
+
+# Clustering hierarki: data dipecah per wilayah (kota/kecamatan), setiap
+# wilayah di-cluster sendiri (normalisasi min-max per wilayah) secara paralel
+# di beberapa proses, lalu opsional centroid seluruh wilayah di-cluster lagi
+# untuk mendapatkan cluster global yang sebanding antarwilayah.
+CLUSTER_COL = 'cluster_wilayah'
+KETERANGAN_COL = 'keterangan_wilayah'
+GLOBAL_CLUSTER_COL = 'cluster_global'
+GLOBAL_KETERANGAN_COL = 'keterangan_global'
+
+# Wilayah kecil digabung ke satu tugas agar biaya pickle/IPC tidak mendominasi
+BATCH_ROWS = 50_000
+PARALLEL_MIN_ROWS = 100_000
+
+
+def partition_hash(df, region_col, columns):
+    # Kunci cache: pembagian wilayah (kode + nama) dan isi kolom fitur
+    codes, regions = pd.factorize(df[region_col], sort=True, use_na_sentinel=False)
+    h = hashlib.sha1(frame_hash(df, columns).encode())
+    h.update(np.ascontiguousarray(codes).tobytes())
+    h.update('\n'.join(map(str, regions)).encode())
+    return h.hexdigest()
+
+
+def cluster_partition(values, num_clusters, engine=ENGINE_AUTO):
+    # values: matriks fitur (skala asli) satu wilayah
+    n_unique = len(np.unique(values, axis=0))
+    k = max(1, min(num_clusters, n_unique))
+    scaler = MinMaxScaler()
+    X_normalized = scaler.fit_transform(values).astype(np.float32)
+    kmeans = fit_kmeans(X_normalized, k, resolve_engine(engine, len(values)))
+    labels = np.asarray(kmeans.labels_, dtype=np.int32)
+    centroids = scaler.inverse_transform(kmeans.cluster_centers_)
+    return labels, centroids, float(kmeans.inertia_)
+
+
+def _cluster_batch(batch, num_clusters, engine, threads=None):
+    # Di proses pekerja, OpenMP/BLAS dibatasi agar proses tidak saling berebut core
+    if threads is not None:
+        set_core_budget(threads)
+    with threadpool_limits(limits=threads):
+        return [(region, *cluster_partition(values, num_clusters, engine)) for region, values in batch]
+
+
+def _batches(partitions, batch_rows=BATCH_ROWS):
+    batch, rows = [], 0
+    for region, values in partitions:
+        batch.append((region, values))
+        rows += len(values)
+        if rows >= batch_rows:
+            yield batch
+            batch, rows = [], 0
+    if batch:
+        yield batch
+
+
+def cluster_regions(df, region_col, columns, num_clusters, engine=ENGINE_AUTO, jobs=None,
+                    progress=None, cancel_event=None):
+    # Kembalikan (frame label per baris, tabel centroid per wilayah-cluster).
+    # Label mengikuti urutan baris df.
+    codes, regions = pd.factorize(df[region_col], sort=True, use_na_sentinel=False)
+    values = df[list(columns)].to_numpy(dtype=np.float64)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(regions) + 1))
+    rows_of = {i: order[bounds[i]:bounds[i + 1]] for i in range(len(regions))}
+    partitions = [(i, values[rows]) for i, rows in rows_of.items() if len(rows)]
+
+    labels = np.full(len(df), -1, dtype=np.int32)
+    keterangan = np.empty(len(df), dtype=object)
+    centroid_rows = []
+
+    def collect(results):
+        for region, region_labels, centroids, inertia in results:
+            rows = rows_of[region]
+            labels[rows] = region_labels
+            keterangan[rows] = describe_clusters(centroids[:, :2], region_labels)[region_labels]
+            counts = np.bincount(region_labels, minlength=len(centroids))
+            for cluster, centroid in enumerate(centroids):
+                centroid_rows.append((regions[region], cluster, int(counts[cluster]), inertia, *centroid))
+
+    batches = list(_batches(partitions))
+    done = 0
+    if jobs == 1 or len(batches) == 1 or len(df) < PARALLEL_MIN_ROWS:
+        for batch in batches:
+            check_cancelled(cancel_event)
+            collect(_cluster_batch(batch, num_clusters, engine))
+            done += 1
+            if progress is not None:
+                progress(done / len(batches))
+    else:
+        workers = min(jobs or os.cpu_count() or 1, len(batches))
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=process_context()) as executor:
+            futures = [executor.submit(_cluster_batch, batch, num_clusters, engine, threads) for batch in batches]
+            try:
+                for future in as_completed(futures):
+                    check_cancelled(cancel_event)
+                    collect(future.result())
+                    done += 1
+                    if progress is not None:
+                        progress(done / len(batches))
+            except CancelledError:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    centroids = pd.DataFrame(
+        centroid_rows, columns=[region_col, CLUSTER_COL, 'jumlah_kelurahan', 'inertia', *columns]
+    ).sort_values([region_col, CLUSTER_COL], ignore_index=True)
+    result = pd.DataFrame({CLUSTER_COL: labels, KETERANGAN_COL: keterangan}, index=df.index)
+    return result, centroids
+
+
+def cluster_centroids(centroids, region_col, columns, num_clusters):
+    # Clustering tingkat kedua atas centroid wilayah, diberi bobot jumlah kelurahan
+    values = centroids[list(columns)].to_numpy(dtype=np.float64)
+    weights = centroids['jumlah_kelurahan'].to_numpy(dtype=np.float64)
+    k = max(1, min(num_clusters, len(np.unique(values, axis=0))))
+    X_normalized = MinMaxScaler().fit_transform(values)
+    kmeans = KMeans(n_clusters=k, random_state=RANDOM_STATE).fit(X_normalized, sample_weight=weights)
+    return centroids.assign(**{GLOBAL_CLUSTER_COL: kmeans.labels_.astype(np.int32)})
+
+
+def assign_global(df, region_col, local, centroids, columns):
+    # Petakan cluster global (per wilayah-cluster) ke setiap baris, lalu
+    # keterangan global dari rata-rata fitur anggota tiap cluster global
+    lookup = pd.Series(
+        centroids[GLOBAL_CLUSTER_COL].to_numpy(),
+        index=pd.MultiIndex.from_frame(centroids[[region_col, CLUSTER_COL]]),
+    )
+    keys = pd.MultiIndex.from_arrays([df[region_col].to_numpy(), local[CLUSTER_COL].to_numpy()])
+    global_labels = lookup.reindex(keys).to_numpy().astype(np.int32)
+    values = df[list(columns)].to_numpy(dtype=np.float64)
+    n_global = global_labels.max() + 1 if len(global_labels) else 0
+    counts = np.bincount(global_labels, minlength=n_global)
+    sums = np.column_stack([
+        np.bincount(global_labels, weights=values[:, j], minlength=n_global) for j in range(values.shape[1])
+    ])
+    means = sums / np.maximum(counts, 1)[:, None]
+    return local.assign(**{
+        GLOBAL_CLUSTER_COL: global_labels,
+        GLOBAL_KETERANGAN_COL: describe_clusters(means[:, :2], global_labels)[global_labels],
+    })
@@ -0,0 +1,244 @@
+import numpy as np
+import pandas as pd
+
+from migrasi.clustering import describe_clusters
+
+# Re-clustering inkremental saat data periode baru datang: centroid lama
+# dipakai sebagai titik awal (warm start) dan hanya baris yang berubah atau
+# baris di dekat batas cluster yang dihitung ulang jaraknya.
+MAX_ITER = 100
+TOL = 1e-6
+MODE_REPLACE = 'replace'
+MODE_ADD = 'add'
+NEAREST_CHUNK_ROWS = 8192
+
+
+class WarmStartKMeans:
+    # Hasil fit dengan atribut yang sama seperti KMeans yang dipakai aplikasi.
+    # margins_: batas bawah margin per baris terhadap cluster_centers_, dipakai
+    # pembaruan berikutnya agar baris yang tidak berubah tidak dihitung ulang.
+
+    def __init__(self, cluster_centers, labels, inertia, n_iter, margins=None):
+        self.cluster_centers_ = cluster_centers
+        self.labels_ = labels
+        self.inertia_ = inertia
+        self.n_iter_ = n_iter
+        self.n_clusters = len(cluster_centers)
+        self.margins_ = margins
+
+    def predict(self, X):
+        return nearest_centroid(X, self.cluster_centers_)[0]
+
+
+def nearest_centroid(X, centers, chunk_size=NEAREST_CHUNK_ROWS):
+    # Label terdekat dan margin (jarak ke centroid kedua - jarak ke terdekat).
+    # Per chunk kecil (muat di cache) dan per centroid: jarak terdekat dan
+    # kedua diperbarui bertahap, tanpa matriks n x k dan tanpa partition.
+    X = np.asarray(X)
+    centers = np.asarray(centers, dtype=np.float64)
+    labels = np.empty(len(X), dtype=np.int32)
+    margins = np.empty(len(X))
+    if len(centers) == 1:
+        labels[:] = 0
+        margins[:] = np.inf
+        return labels, margins
+    for start in range(0, len(X), chunk_size):
+        XT = np.ascontiguousarray(X[start:start + chunk_size].T, dtype=np.float64)
+        diff = np.empty_like(XT)
+        best = np.full(XT.shape[1], np.inf)
+        second = np.full(XT.shape[1], np.inf)
+        nearest = np.zeros(XT.shape[1], dtype=np.int32)
+        for cluster, center in enumerate(centers):
+            np.subtract(XT, center[:, None], out=diff)
+            d = np.einsum('ij,ij->j', diff, diff)
+            closer = d < best
+            np.minimum(second, d, out=second)
+            np.copyto(second, best, where=closer)
+            np.copyto(best, d, where=closer)
+            np.copyto(nearest, cluster, where=closer)
+        labels[start:start + chunk_size] = nearest
+        np.subtract(np.sqrt(second), np.sqrt(best), out=margins[start:start + chunk_size])
+    return labels, margins
+
+
+def merge_period(previous_df, update_df, kelurahan_col, columns, mode=MODE_REPLACE):
+    # Gabungkan data periode baru ke data lama berdasarkan nama kelurahan.
+    # mode 'replace' mengganti nilai lama, 'add' menjumlahkannya (akumulasi periode).
+    update = update_df[[kelurahan_col, *columns]].drop_duplicates(kelurahan_col, keep='last')
+    update = update.assign(**{kelurahan_col: update[kelurahan_col].astype(str)}).set_index(kelurahan_col)
+    names = previous_df[kelurahan_col].astype(str)
+    position = pd.Series(np.arange(len(previous_df)), index=names)
+    position = position[~position.index.duplicated(keep='last')]
+
+    existing = update.index.isin(position.index)
+    combined = previous_df[[kelurahan_col, *columns]].copy()
+    combined[kelurahan_col] = names.to_numpy()
+    values = combined[columns].to_numpy(dtype=np.float64, copy=True)
+
+    rows = position[update.index[existing]].to_numpy()
+    new_values = update.loc[existing, columns].to_numpy(dtype=np.float64)
+    if mode == MODE_ADD:
+        new_values = values[rows] + new_values
+    changed = rows[(new_values != values[rows]).any(axis=1)]
+    values[rows] = new_values
+
+    added = update.loc[~existing, columns].reset_index()
+    combined = pd.concat([
+        combined.assign(**{col: values[:, i] for i, col in enumerate(columns)}),
+        added,
+    ], ignore_index=True)
+    for col in columns:
+        combined[col] = pd.to_numeric(combined[col], downcast='integer')
+    added_rows = np.arange(len(previous_df), len(combined))
+    return combined, changed, added_rows
+
+
+def warm_start_update(X, labels, centers, dirty, margins=None, max_iter=MAX_ITER, tol=TOL):
+    # X: seluruh data (ternormalisasi), labels: label lama (baris baru boleh
+    # berisi apa saja), dirty: indeks baris baru/berubah, margins: batas bawah
+    # margin baris lama terhadap centers (margins_ dari pembaruan sebelumnya).
+    # Baris "bersih" hanya dihitung ulang bila margin-nya lebih kecil dari
+    # dua kali total pergeseran centroid sejak margin itu dihitung (batas
+    # segitiga ala Hamerly); baris lain pasti tidak pindah cluster. Dengan
+    # margins, biaya sebanding dengan jumlah baris yang berubah; tanpa margins
+    # ada satu lintasan awal O(n·k) untuk mengisinya. Kembalikan (model,
+    # jumlah baris yang jaraknya dihitung pada lintasan awal, jumlah baris
+    # yang dihitung ulang di iterasi berikutnya).
+    n_rows = len(X)
+    centers = np.asarray(centers, dtype=np.float64).copy()
+    n_clusters = len(centers)
+
+    # slack = margin + 2 x total pergeseran saat margin dihitung, sehingga
+    # syarat hitung ulang cukup slack < 2 x total pergeseran sekarang
+    slack = np.empty(n_rows)
+    if margins is None:
+        # Tanpa margin tersimpan: satu lintasan atas semua baris terhadap centroid lama
+        labels, slack[:] = nearest_centroid(X, centers)
+        labels = labels.astype(np.intp)
+        initial = n_rows
+    else:
+        # Baris lama dengan batas bawah negatif (label lamanya belum tentu
+        # terdekat) ikut dihitung bersama baris baru/berubah
+        labels = np.asarray(labels, dtype=np.intp).copy()
+        slack[:len(margins)] = margins
+        recheck = np.zeros(n_rows, dtype=bool)
+        recheck[dirty] = True
+        recheck[:len(margins)] |= slack[:len(margins)] < 0
+        dirty = np.flatnonzero(recheck)
+        initial = len(dirty)
+        labels[dirty], slack[dirty] = nearest_centroid(X[dirty], centers)
+    drift = 0.0
+
+    counts = np.bincount(labels, minlength=n_clusters).astype(np.float64)
+    sums = np.stack(
+        [np.bincount(labels, weights=X[:, j], minlength=n_clusters) for j in range(X.shape[1])], axis=1
+    )
+
+    n_iter = 0
+    recomputed = 0
+    for n_iter in range(1, max_iter + 1):
+        new_centers = np.where(counts[:, None] > 0, sums / np.maximum(counts, 1)[:, None], centers)
+        shift = np.sqrt(((new_centers - centers) ** 2).sum(axis=1)).max()
+        centers = new_centers
+        drift += shift
+        if shift <= tol:
+            break
+
+        candidates = np.flatnonzero(slack < 2 * drift)
+        if candidates.size == 0:
+            continue
+        new_labels, margin = nearest_centroid(X[candidates], centers)
+        slack[candidates] = margin + 2 * drift
+        recomputed += candidates.size
+        changed = new_labels != labels[candidates]
+        moved = candidates[changed]
+        if moved.size:
+            old, new = labels[moved], new_labels[changed]
+            np.add.at(sums, old, -X[moved])
+            np.add.at(sums, new, X[moved])
+            counts -= np.bincount(old, minlength=n_clusters)
+            counts += np.bincount(new, minlength=n_clusters)
+            labels[moved] = new
+
+    # Inertia dari statistik cluster tanpa lintasan jarak tambahan:
+    # sum ||x||^2 - 2 sum_c S_c.c + sum_c n_c ||c||^2
+    inertia = float(
+        np.einsum('ij,ij->', X, X, dtype=np.float64)
+        - 2 * np.einsum('ij,ij->', sums, centers) + (counts * (centers ** 2).sum(axis=1)).sum()
+    )
+    # Batas bawah margin terhadap centroid akhir, dibulatkan ke bawah ke float32
+    slack -= 2 * drift
+    bound = np.nextafter(slack.astype(np.float32), np.float32(-np.inf))
+    model = WarmStartKMeans(centers, labels.astype(np.int32), max(inertia, 0.0), n_iter, bound)
+    return model, initial, recomputed
+
+
+def change_report(names, old_labels, old_keterangan, new_labels, new_keterangan, added_rows):
+    # Kelurahan yang pindah cluster atau keterangannya berubah, plus kelurahan baru
+    n_old = len(old_labels)
+    old_names = names[:n_old]
+    moved = (old_labels != new_labels[:n_old]) | (old_keterangan != new_keterangan[:n_old])
+    report = pd.DataFrame({
+        'Kelurahan': old_names[moved],
+        'cluster_lama': old_labels[moved],
+        'cluster_baru': new_labels[:n_old][moved],
+        'keterangan_lama': old_keterangan[moved],
+        'keterangan_baru': new_keterangan[:n_old][moved],
+    })
+    report['keterangan_berubah'] = report['keterangan_lama'] != report['keterangan_baru']
+    added = pd.DataFrame({
+        'Kelurahan': names[added_rows],
+        'cluster_lama': pd.NA,
+        'cluster_baru': new_labels[added_rows],
+        'keterangan_lama': pd.NA,
+        'keterangan_baru': new_keterangan[added_rows],
+        'keterangan_berubah': False,
+    })
+    return pd.concat([report, added], ignore_index=True) if len(added) else report
+
+
+def update_clustering(previous_df, update_df, kelurahan_col, columns, scaler, kmeans, mode=MODE_REPLACE,
+                      X_previous=None):
+    # Scaler lama dipertahankan agar koordinat baris yang tidak berubah tetap
+    # sama; nilai baru di luar rentang lama tetap valid untuk K-Means.
+    # X_previous: matriks ternormalisasi previous_df (bila ada), sehingga hanya
+    # baris baru/berubah yang dinormalisasi ulang.
+    combined, changed, added_rows = merge_period(previous_df, update_df, kelurahan_col, columns, mode)
+    dirty = np.concatenate([changed, added_rows])
+    if X_previous is not None and len(X_previous) == len(previous_df):
+        X_normalized = np.empty((len(combined), len(columns)), dtype=np.float32)
+        X_normalized[:len(X_previous)] = X_previous
+        X_normalized[dirty] = scaler.transform(combined[columns].iloc[dirty].to_numpy())
+    else:
+        X_normalized = scaler.transform(combined[columns].to_numpy()).astype(np.float32)
+
+    old_labels = np.asarray(kmeans.labels_, dtype=np.int32)
+    old_centroids = scaler.inverse_transform(kmeans.cluster_centers_)
+    old_keterangan = describe_clusters(old_centroids, old_labels)[old_labels]
+    labels = np.concatenate([old_labels, np.zeros(len(added_rows), dtype=np.int32)])
+    # Margin tersimpan dari pembaruan sebelumnya hanya berlaku untuk baris yang sama
+    margins = getattr(kmeans, 'margins_', None)
+    if margins is not None and len(margins) != len(old_labels):
+        margins = None
+
+    model, initial, recomputed = warm_start_update(
+        X_normalized, labels, kmeans.cluster_centers_, dirty, margins
+    )
+    keterangan = describe_clusters(scaler.inverse_transform(model.cluster_centers_), model.labels_)[model.labels_]
+    combined['cluster'] = model.labels_
+    combined['keterangan'] = keterangan
+
+    report = change_report(
+        combined[kelurahan_col].to_numpy(), old_labels, old_keterangan, model.labels_, keterangan, added_rows
+    )
+    stats = {
+        'changed': int(len(changed)),
+        'added': int(len(added_rows)),
+        # Lintasan awal (semua baris, atau hanya baris berubah bila margin
+        # tersimpan) dan perhitungan ulang di iterasi dicatat terpisah
+        'initial': int(initial),
+        'recomputed': int(recomputed),
+        'n_iter': int(model.n_iter_),
+        'out_of_range': int(((X_normalized < 0) | (X_normalized > 1)).any(axis=1).sum()),
+    }
+    return combined, X_normalized, model, report, stats
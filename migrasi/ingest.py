@@ -0,0 +1,63 @@
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+CHUNK_SIZE = 100_000
+STREAMING_THRESHOLD_BYTES = 50 * 1024 * 1024
+
+
+def read_header(buffer):
+    # Hanya baca baris header agar pilihan kolom tidak memuat seluruh file
+    buffer.seek(0)
+    columns = pd.read_csv(buffer, nrows=0).columns.tolist()
+    buffer.seek(0)
+    return columns
+
+
+def downcast_numeric(series):
+    series = pd.to_numeric(series)
+    if pd.api.types.is_integer_dtype(series):
+        return pd.to_numeric(series, downcast='integer')
+    return pd.to_numeric(series, downcast='float')
+
+
+def compact_frame(df):
+    # Kolom teks menjadi kategori, kolom numerik diperkecil dtype-nya
+    data = {}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series):
+            data[col] = series
+        elif pd.api.types.is_numeric_dtype(series):
+            data[col] = downcast_numeric(series)
+        else:
+            data[col] = series.astype(str).astype('category')
+    return pd.DataFrame(data)
+
+
+def read_columns_chunked(buffer, name_col, numeric_cols, chunk_size=CHUNK_SIZE):
+    # Baca file per chunk, simpan hanya kolom nama dan kolom numerik terpilih.
+    # Memori puncak = satu chunk + kolom terpilih yang sudah diperkecil dtype-nya,
+    # di luar buffer itu sendiri (file unggahan Streamlit sudah utuh di memori).
+    numeric_cols = list(dict.fromkeys(numeric_cols))
+    usecols = list(dict.fromkeys([name_col] + numeric_cols)) if name_col else numeric_cols
+    buffer.seek(0)
+    names, numbers = [], {col: [] for col in numeric_cols}
+    for chunk in pd.read_csv(buffer, usecols=usecols, chunksize=chunk_size):
+        if name_col:
+            names.append(chunk[name_col].astype(str).astype('category'))
+        for col in numeric_cols:
+            numbers[col].append(downcast_numeric(chunk[col]))
+        del chunk
+    buffer.seek(0)
+
+    data = {}
+    if name_col:
+        data[name_col] = (
+            union_categoricals(names) if names else pd.Categorical([])
+        )
+    for col in numeric_cols:
+        if numbers[col]:
+            data[col] = downcast_numeric(pd.concat(numbers[col], ignore_index=True))
+        else:
+            data[col] = pd.Series([], dtype='int32')
+    return pd.DataFrame(data)
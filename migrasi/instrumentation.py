@@ -0,0 +1,146 @@
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+from migrasi.paths import BASE_DIR
+
+# Instrumentasi opt-in: aktif hanya bila MIGRASI_DIAGNOSTICS=1. Statistik
+# latensi disimpan per proses sehingga mencakup semua sesi pengguna.
+ENABLED = os.environ.get('MIGRASI_DIAGNOSTICS') == '1'
+PROFILE_DIR = os.path.join(BASE_DIR, 'profiles')
+WINDOW = 1000
+
+_lock = threading.Lock()
+_latencies = {}
+_visited = set()
+
+
+def _record(stage, seconds):
+    with _lock:
+        _latencies.setdefault(stage, deque(maxlen=WINDOW)).append(seconds)
+
+
+@contextmanager
+def timed(stage):
+    # Hanya latensi. Memori tidak diukur per tahap: tracemalloc bersifat global
+    # per proses (tahap dari sesi dan job lain saling mengganggu puncaknya) dan
+    # memperlambat semua alokasi, sehingga hanya dipakai saat rerun diprofil.
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(stage, time.perf_counter() - start)
+
+
+def begin_run(state, menu):
+    # Dipanggil di awal setiap rerun; menutup run sebelumnya yang berhenti
+    # lebih awal (mis. karena st.stop) tanpa mencatat waktunya
+    if not ENABLED:
+        return
+    previous = state.get('_diagnostics_run')
+    if previous is not None:
+        _finish_profile(state, previous)
+    run = {'menu': menu, 'start': time.perf_counter(), 'profiler': None}
+    if state.get('_diagnostics_profile_next'):
+        state['_diagnostics_profile_next'] = False
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            run['profiler'] = profiler
+        except ValueError:
+            # Profiler lain (sesi lain) sedang aktif
+            pass
+        else:
+            # Puncak memori hanya diukur pada rerun yang diprofil ini
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                run['traced'] = True
+    state['_diagnostics_run'] = run
+
+
+def end_run(state):
+    if not ENABLED:
+        return
+    run = state.get('_diagnostics_run')
+    if run is None:
+        return
+    if run['profiler'] is not None:
+        # Rerun yang diprofil jauh lebih lambat; tidak ikut statistik latensi
+        _finish_profile(state, run)
+        return
+    # Rerun pertama tiap halaman per proses (termasuk impor modul halaman)
+    # dicatat terpisah agar persentil page:<menu> mencerminkan rerun biasa
+    menu = run['menu']
+    with _lock:
+        cold = menu not in _visited
+        _visited.add(menu)
+    stage = f"cold_start:{menu}" if cold else f"page:{menu}"
+    _record(stage, time.perf_counter() - run['start'])
+    _finish_profile(state, run)
+
+
+def _finish_profile(state, run):
+    state['_diagnostics_run'] = None
+    profiler = run['profiler']
+    if profiler is None:
+        return
+    profiler.disable()
+    if run.get('traced'):
+        # Puncak seluruh proses selama rerun ini (termasuk sesi dan job lain yang berjalan bersamaan)
+        state['_diagnostics_last_peak'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(PROFILE_DIR, f"rerun-{time.strftime('%Y%m%d-%H%M%S')}-{run['menu']}.prof")
+    profiler.dump_stats(path)
+    state['_diagnostics_last_profile'] = path
+
+
+def request_profile(state):
+    state['_diagnostics_profile_next'] = True
+
+
+def profile_summary(path, limit=30):
+    out = io.StringIO()
+    pstats.Stats(path, stream=out).sort_stats('cumulative').print_stats(limit)
+    return out.getvalue()
+
+
+def summary():
+    # Ringkasan latensi per tahap: jumlah dan persentil.
+    # NumPy diimpor di sini agar modul ini tetap ringan untuk shell aplikasi.
+    import numpy as np
+
+    with _lock:
+        latencies = {stage: np.array(values) for stage, values in _latencies.items()}
+    rows = []
+    for stage in sorted(latencies):
+        values = latencies[stage]
+        rows.append({
+            'tahap': stage,
+            'jumlah': len(values),
+            'p50 (ms)': np.percentile(values, 50) * 1000,
+            'p90 (ms)': np.percentile(values, 90) * 1000,
+            'p99 (ms)': np.percentile(values, 99) * 1000,
+            'maks (ms)': values.max() * 1000,
+        })
+    return rows
+
+
+def histogram(stage, bins=20):
+    import numpy as np
+
+    with _lock:
+        values = np.array(_latencies.get(stage, ()))
+    if len(values) == 0:
+        return None
+    counts, edges = np.histogram(values * 1000, bins=bins)
+    return counts, edges
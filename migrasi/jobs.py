@@ -0,0 +1,89 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+# Eksekutor job clustering di latar belakang, dibagi semua sesi. Job dengan
+# kunci yang sama (mis. hash data + engine) hanya dijalankan sekali; job yang
+# sudah selesai disimpan (LRU) sehingga registry ini juga berfungsi sebagai
+# cache hasil per proses. Jumlah thread job tidak membatasi pemakaian CPU:
+# setiap fit KMeans memesan core dari jatah bersama (clustering.reserve_cores),
+# jadi job yang berjalan bersamaan bergantian memakai core, bukan menumpuk thread.
+MAX_WORKERS = max(2, os.cpu_count() or 1)
+MAX_FINISHED = 32
+
+_lock = threading.Lock()
+_jobs = OrderedDict()
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='migrasi-job')
+
+
+class Job:
+
+    def __init__(self, key, label):
+        self.key = key
+        self.label = label
+        self.progress = 0.0
+        self.cancel_event = threading.Event()
+        self.subscribers = 0
+        self.submitted_at = time.time()
+        self.future = None
+
+    def set_progress(self, value):
+        self.progress = min(max(float(value), 0.0), 1.0)
+
+    def done(self):
+        return self.future.done()
+
+    def cancelled(self):
+        if not self.done():
+            return self.cancel_event.is_set()
+        return self.future.cancelled() or isinstance(self.future.exception(), CancelledError)
+
+    def failed(self):
+        return self.done() and not self.cancelled() and self.future.exception() is not None
+
+    def succeeded(self):
+        return self.done() and not self.cancelled() and self.future.exception() is None
+
+    def result(self):
+        return self.future.result()
+
+
+def _evict():
+    finished = [key for key, job in _jobs.items() if job.done()]
+    for key in finished[:max(len(finished) - MAX_FINISHED, 0)]:
+        del _jobs[key]
+
+
+def submit(key, func, label=''):
+    # func(progress, cancel_event) dijalankan di worker pool. Job yang
+    # dibatalkan atau gagal dijalankan ulang bila diminta lagi.
+    with _lock:
+        job = _jobs.get(key)
+        if job is None or job.cancelled() or job.failed():
+            job = Job(key, label)
+            job.future = _executor.submit(func, job.set_progress, job.cancel_event)
+            _jobs[key] = job
+        _jobs.move_to_end(key)
+        _evict()
+        return job
+
+
+def subscribe(job):
+    with _lock:
+        job.subscribers += 1
+
+
+def release(job):
+    # Batalkan job yang belum selesai bila tidak ada sesi lain yang menunggunya
+    with _lock:
+        job.subscribers = max(job.subscribers - 1, 0)
+        if job.subscribers == 0 and not job.done():
+            job.cancel_event.set()
+            job.future.cancel()
+
+
+def active_jobs():
+    with _lock:
+        return [job for job in _jobs.values() if not job.done()]
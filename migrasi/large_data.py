@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Mode data besar: batas jumlah titik yang dikirim ke browser
+SCATTERGL_THRESHOLD = 5_000
+BIN_THRESHOLD = 200_000
+GRID_BINS = 150
+TREEMAP_THRESHOLD = 2_000
+TREEMAP_TOP_N = 25
+AREA_MAX_POINTS = 2_000
+
+
+def cluster_colors(n_clusters):
+    # Sama dengan cmap 'rainbow' pada scatter Matplotlib: warna ke-i = cmap(i / k)
+    return px.colors.sample_colorscale('Rainbow', [i / n_clusters for i in range(n_clusters)])
+
+
+def downsample_rows(df, max_points=AREA_MAX_POINTS):
+    # Ambil baris berjarak sama agar bentuk kurva tetap terlihat
+    if len(df) <= max_points:
+        return df
+    positions = np.unique(np.linspace(0, len(df) - 1, max_points).round().astype(int))
+    return df.iloc[positions]
+
+
+def _bin_index(values, bins):
+    low, high = values.min(), values.max()
+    step = (high - low) / bins if high > low else 1.0
+    return np.clip(((values - low) / step).astype(np.int64), 0, bins - 1), low, step
+
+
+def grid_bins(x, y, labels, n_clusters, bins=GRID_BINS):
+    # Agregasi titik ke grid 2D; setiap sel diwarnai cluster dominannya
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    ix, x_low, x_step = _bin_index(x, bins)
+    iy, y_low, y_step = _bin_index(y, bins)
+    cell = ix * bins + iy
+    counts = np.bincount(
+        cell * n_clusters + np.asarray(labels, dtype=np.int64),
+        minlength=bins * bins * n_clusters
+    ).reshape(bins * bins, n_clusters)
+    total = counts.sum(axis=1)
+    occupied = np.flatnonzero(total)
+    return pd.DataFrame({
+        'x': x_low + (occupied // bins + 0.5) * x_step,
+        'y': y_low + (occupied % bins + 0.5) * y_step,
+        'cluster': counts[occupied].argmax(axis=1),
+        'jumlah': total[occupied],
+    })
+
+
+def scatter_figure(x, y, labels, centroids, n_clusters, x_label, y_label):
+    # Scatter WebGL; di atas BIN_THRESHOLD titik diganti sel grid teragregasi
+    colors = cluster_colors(n_clusters)
+    labels = np.asarray(labels)
+    fig = go.Figure()
+    if len(labels) > BIN_THRESHOLD:
+        binned = grid_bins(x, y, labels, n_clusters)
+        size = 4 + 10 * np.log1p(binned['jumlah']) / np.log1p(binned['jumlah'].max())
+        for i in range(n_clusters):
+            cells = binned[binned['cluster'] == i]
+            fig.add_trace(go.Scattergl(
+                x=cells['x'], y=cells['y'], mode='markers', name=f'Cluster {i}',
+                marker=dict(color=colors[i], size=size[cells.index], opacity=0.7),
+                customdata=cells['jumlah'],
+                hovertemplate="Jumlah kelurahan: %{customdata}<extra>Cluster " + str(i) + "</extra>",
+            ))
+    else:
+        x = np.asarray(x)
+        y = np.asarray(y)
+        for i in range(n_clusters):
+            mask = labels == i
+            fig.add_trace(go.Scattergl(
+                x=x[mask], y=y[mask], mode='markers', name=f'Cluster {i}',
+                marker=dict(color=colors[i], opacity=0.7),
+            ))
+    for i, centroid in enumerate(centroids):
+        fig.add_trace(go.Scatter(
+            x=[centroid[0]], y=[centroid[1]], mode='markers', name=f'Centroid Cluster {i}',
+            marker=dict(symbol='star', size=18, color=colors[i], line=dict(width=1, color='black')),
+        ))
+    fig.update_layout(title="Scatter Plot Clustering", xaxis_title=x_label, yaxis_title=y_label)
+    return fig
+
+
+def top_n_per_cluster(df, kelurahan_col, rank_cols, top_n=TREEMAP_TOP_N, group_cols=('cluster',)):
+    # Top-N kelurahan per cluster (berdasarkan total migrasi), sisanya
+    # digabung ke satu kotak "Lainnya" per cluster. group_cols bisa berisi
+    # kolom wilayah + cluster untuk treemap bertingkat.
+    group_cols = list(group_cols)
+    score = df[rank_cols].sum(axis=1)
+    rank = score.groupby([df[col] for col in group_cols], observed=True).rank(method='first', ascending=False)
+    top = df.loc[rank <= top_n, [*group_cols, kelurahan_col]].astype(str).assign(jumlah=1)
+    other = df.loc[rank > top_n].groupby(group_cols, observed=True).size().rename('jumlah').reset_index()
+    other[kelurahan_col] = 'Lainnya'
+    return pd.concat([top, other.astype({col: str for col in group_cols})], ignore_index=True)
@@ -0,0 +1,8 @@
+import os
+
+# Lokasi berkas aplikasi. Modul ini sengaja tanpa dependensi berat agar
+# instrumentasi dan shell aplikasi bisa mengimpornya tanpa memuat pandas.
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATASET_PATH = os.path.join(BASE_DIR, 'migrasi_kota_bekasi.csv')
+CLUSTER_PATH = os.path.join(BASE_DIR, 'output_cluster.csv')
+IMAGE_PATH = os.path.join(BASE_DIR, 'migrasi.jpg')
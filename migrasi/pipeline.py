@@ -0,0 +1,182 @@
+import os
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import pandas as pd
+from threadpoolctl import threadpool_limits
+
+from migrasi.clustering import (
+    ENGINE_AUTO, ENGINE_MINIBATCH, K_RANGE, describe_clusters, elbow_sweep, fit_kmeans, process_context,
+    resolve_engine, set_core_budget,
+)
+from migrasi.data import KELUAR_COL, KELURAHAN_COL, MASUK_COL
+from migrasi.ingest import CHUNK_SIZE, read_columns_chunked
+from migrasi.preprocessing import normalize_csv_memmap, normalize_minmax
+
+# Skema keluaran sama dengan output_cluster.csv
+OUTPUT_COLUMNS = ['Kelurahan', 'Migrasi_Masuk', 'Migrasi_Keluar', 'cluster', 'keterangan']
+DEFAULT_CLUSTERS = 2
+
+
+@contextmanager
+def stage(timings, name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = time.perf_counter() - start
+
+
+def label_frame(df, kelurahan_col, masuk_col, keluar_col, scaler, kmeans):
+    keterangan = describe_clusters(scaler.inverse_transform(kmeans.cluster_centers_), kmeans.labels_)
+    return pd.DataFrame({
+        'Kelurahan': df[kelurahan_col].astype(str).to_numpy(),
+        'Migrasi_Masuk': df[masuk_col].to_numpy(),
+        'Migrasi_Keluar': df[keluar_col].to_numpy(),
+        'cluster': kmeans.labels_,
+        'keterangan': keterangan[kmeans.labels_],
+    }, columns=OUTPUT_COLUMNS)
+
+
+def _fit_clusters(X_normalized, num_clusters, engine, elbow, timings):
+    inertias = None
+    kmeans = None
+    if elbow:
+        with stage(timings, 'elbow'):
+            models = elbow_sweep(X_normalized, K_RANGE, engine)
+        inertias = {k: float(model.inertia_) for k, model in models.items()}
+        kmeans = models.get(num_clusters)
+    if kmeans is None:
+        with stage(timings, 'cluster'):
+            kmeans = fit_kmeans(X_normalized, num_clusters, engine)
+    return kmeans, inertias
+
+
+def cluster_frame(df, num_clusters=DEFAULT_CLUSTERS, kelurahan_col=KELURAHAN_COL,
+                  masuk_col=MASUK_COL, keluar_col=KELUAR_COL, engine=ENGINE_AUTO,
+                  elbow=False, timings=None):
+    # Normalisasi -> (Elbow Method) -> KMeans -> frame berlabel
+    timings = {} if timings is None else timings
+    with stage(timings, 'normalize'):
+        scaler, X_normalized = normalize_minmax(df, [masuk_col, keluar_col])
+    engine = resolve_engine(engine, len(X_normalized))
+    kmeans, inertias = _fit_clusters(X_normalized, num_clusters, engine, elbow, timings)
+
+    with stage(timings, 'label'):
+        result = label_frame(df, kelurahan_col, masuk_col, keluar_col, scaler, kmeans)
+    return result, scaler, kmeans, inertias
+
+
+def _report(input_path, output_path, n_rows, kmeans, inertias, timings):
+    return {
+        'input': input_path,
+        'output': output_path,
+        'n_rows': n_rows,
+        'inertia': float(kmeans.inertia_),
+        'inertias': inertias,
+        'timings': timings,
+    }
+
+
+def run_pipeline_out_of_core(input_path, output_path, num_clusters=DEFAULT_CLUSTERS, kelurahan_col=KELURAHAN_COL,
+                             masuk_col=MASUK_COL, keluar_col=KELUAR_COL, elbow=False, chunk_size=CHUNK_SIZE):
+    # Engine mini-batch untuk file lebih besar dari RAM: matriks ternormalisasi
+    # ditulis ke np.memmap di samping file keluaran, MiniBatchKMeans membaca
+    # memmap itu per chunk, dan keluaran ditulis per chunk. Yang tetap di
+    # memori hanya label (4 byte per baris) dan satu chunk.
+    timings = {}
+    columns = [masuk_col, keluar_col]
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    with tempfile.TemporaryDirectory(dir=output_dir, prefix='.migrasi-') as workdir:
+        with stage(timings, 'normalize'):
+            scaler, X_normalized = normalize_csv_memmap(
+                input_path, columns, os.path.join(workdir, 'X_normalized.f32'), chunk_size
+            )
+        n_rows = len(X_normalized)
+        kmeans, inertias = _fit_clusters(X_normalized, num_clusters, ENGINE_MINIBATCH, elbow, timings)
+        del X_normalized
+
+    with stage(timings, 'write'):
+        labels = kmeans.labels_
+        keterangan = describe_clusters(scaler.inverse_transform(kmeans.cluster_centers_), labels)
+        start = 0
+        chunks = pd.read_csv(input_path, usecols=[kelurahan_col, *columns], chunksize=chunk_size)
+        for chunk in chunks:
+            chunk_labels = labels[start:start + len(chunk)]
+            pd.DataFrame({
+                'Kelurahan': chunk[kelurahan_col].astype(str).to_numpy(),
+                'Migrasi_Masuk': chunk[masuk_col].to_numpy(),
+                'Migrasi_Keluar': chunk[keluar_col].to_numpy(),
+                'cluster': chunk_labels,
+                'keterangan': keterangan[chunk_labels],
+            }, columns=OUTPUT_COLUMNS).to_csv(output_path, mode='w' if start == 0 else 'a',
+                                              header=start == 0, index=False)
+            start += len(chunk)
+    return _report(input_path, output_path, n_rows, kmeans, inertias, timings)
+
+
+def run_pipeline(input_path, output_path, num_clusters=DEFAULT_CLUSTERS, kelurahan_col=KELURAHAN_COL,
+                 masuk_col=MASUK_COL, keluar_col=KELUAR_COL, engine=ENGINE_AUTO, elbow=False,
+                 chunk_size=CHUNK_SIZE):
+    if engine == ENGINE_MINIBATCH:
+        return run_pipeline_out_of_core(
+            input_path, output_path, num_clusters, kelurahan_col, masuk_col, keluar_col, elbow, chunk_size
+        )
+    timings = {}
+    with stage(timings, 'read'):
+        with open(input_path, 'rb') as f:
+            df = read_columns_chunked(f, kelurahan_col, [masuk_col, keluar_col], chunk_size)
+    result, _, kmeans, inertias = cluster_frame(
+        df, num_clusters, kelurahan_col, masuk_col, keluar_col, engine, elbow, timings
+    )
+    with stage(timings, 'write'):
+        result.to_csv(output_path, index=False)
+    return _report(input_path, output_path, len(result), kmeans, inertias, timings)
+
+
+def output_path_for(input_path, output_dir):
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    return os.path.join(output_dir, f'{stem}_cluster.csv')
+
+
+def output_paths(input_paths, output_dir):
+    # Input bernama sama di direktori berbeda (mis. jakarta/migrasi.csv dan
+    # bekasi/migrasi.csv) diberi awalan nama direktorinya. Keluaran yang tetap
+    # bentrok ditolak di awal agar file tidak saling menimpa tanpa pesan.
+    stems = Counter(os.path.basename(output_path_for(path, output_dir)) for path in input_paths)
+    outputs = []
+    for path in input_paths:
+        output = output_path_for(path, output_dir)
+        if stems[os.path.basename(output)] > 1:
+            parent = os.path.basename(os.path.dirname(os.path.abspath(path)))
+            output = os.path.join(output_dir, f'{parent}_{os.path.basename(output)}')
+        outputs.append(output)
+    duplicates = sorted(output for output, count in Counter(outputs).items() if count > 1)
+    if duplicates:
+        raise ValueError(f"Beberapa file input menghasilkan file keluaran yang sama: {', '.join(duplicates)}")
+    return outputs
+
+def _run_pipeline_limited(input_path, output_path, threads, **options):
+    # Di proses pekerja, OpenMP/BLAS dibatasi agar proses tidak saling berebut core
+    set_core_budget(threads)
+    with threadpool_limits(limits=threads):
+        return run_pipeline(input_path, output_path, **options)
+
+
+def run_many(input_paths, output_dir, jobs=None, **options):
+    # Satu proses per file input (mis. satu file per kota/kabupaten)
+    outputs = output_paths(input_paths, output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    if jobs == 1 or len(input_paths) == 1:
+        return [run_pipeline(i, o, **options) for i, o in zip(input_paths, outputs)]
+    workers = min(jobs or os.cpu_count() or 1, len(input_paths))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=process_context()) as executor:
+        futures = [
+            executor.submit(_run_pipeline_limited, i, o, threads, **options) for i, o in zip(input_paths, outputs)
+        ]
+        return [future.result() for future in futures]
+
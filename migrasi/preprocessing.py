@@ -0,0 +1,97 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+from sklearn.decomposition import PCA
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import MinMaxScaler
+
+from migrasi.clustering import RANDOM_STATE
+
+CHUNK_SIZE = 100_000
+
+
+def frame_hash(df, columns):
+    # Hash isi kolom terpilih untuk mendeteksi apakah data sumber berubah
+    h = hashlib.sha1()
+    for col in columns:
+        values = np.ascontiguousarray(df[col].to_numpy())
+        h.update(str((col, values.dtype.str, values.shape)).encode())
+        h.update(values.tobytes())
+    return h.hexdigest()
+
+
+def _chunks(df, columns, chunk_size):
+    for start in range(0, len(df), chunk_size):
+        yield start, df[columns].iloc[start:start + chunk_size].to_numpy(dtype=np.float64)
+
+
+def normalize_minmax(df, columns, chunk_size=CHUNK_SIZE):
+    # Dua lintasan per chunk: partial_fit untuk min/max berjalan, lalu
+    # transform langsung ke array float32 yang sudah dialokasikan
+    columns = list(columns)
+    scaler = MinMaxScaler()
+    for _, chunk in _chunks(df, columns, chunk_size):
+        scaler.partial_fit(chunk)
+
+    X_normalized = np.empty((len(df), len(columns)), dtype=np.float32)
+    for start, chunk in _chunks(df, columns, chunk_size):
+        X_normalized[start:start + len(chunk)] = scaler.transform(chunk)
+    return scaler, X_normalized
+
+
+def _csv_chunks(path, columns, chunk_size):
+    start = 0
+    for chunk in pd.read_csv(path, usecols=columns, chunksize=chunk_size):
+        values = chunk[columns].to_numpy(dtype=np.float64)
+        yield start, values
+        start += len(values)
+
+
+def normalize_csv_memmap(path, columns, memmap_path, chunk_size=CHUNK_SIZE):
+    # Versi out-of-core dari normalize_minmax untuk file CSV: dua lintasan baca
+    # per chunk, hasilnya ditulis ke np.memmap di disk sehingga matriks
+    # ternormalisasi tidak pernah dimuat utuh ke memori
+    columns = list(columns)
+    scaler = MinMaxScaler()
+    n_rows = 0
+    for _, chunk in _csv_chunks(path, columns, chunk_size):
+        scaler.partial_fit(chunk)
+        n_rows += len(chunk)
+    if n_rows == 0:
+        raise ValueError(f"File {path} tidak berisi baris data.")
+
+    X_normalized = np.memmap(memmap_path, dtype=np.float32, mode='w+', shape=(n_rows, len(columns)))
+    for start, chunk in _csv_chunks(path, columns, chunk_size):
+        X_normalized[start:start + len(chunk)] = scaler.transform(chunk)
+    X_normalized.flush()
+    return scaler, X_normalized
+
+
+def reduce_pca(X_normalized, n_components):
+    # Reduksi dimensi sebelum K-Means: waktu fit mengikuti jumlah komponen,
+    # bukan jumlah fitur. Scaler dan PCA digabung dalam satu Pipeline sehingga
+    # transform/inverse_transform di tempat lain tetap bekerja seperti scaler biasa.
+    pca = PCA(n_components=n_components, random_state=RANDOM_STATE)
+    X_reduced = pca.fit_transform(X_normalized).astype(np.float32)
+    return pca, X_reduced
+
+
+def feature_pipeline(scaler, pca=None):
+    if pca is None:
+        return scaler
+    return Pipeline([('minmax', scaler), ('pca', pca)])
+
+
+def pca_components(scaler):
+    # Jumlah komponen PCA pada scaler/pipeline, None bila tanpa PCA
+    if isinstance(scaler, Pipeline) and 'pca' in scaler.named_steps:
+        return scaler.named_steps['pca'].n_components_
+    return None
+
+
+def preprocess_hash(df, columns, n_components=None, data_hash=None):
+    # data_hash: frame_hash(df, columns) yang sudah dihitung sebelumnya, bila ada
+    if data_hash is None:
+        data_hash = frame_hash(df, columns)
+    return data_hash if n_components is None else f"{data_hash}-pca{n_components}"
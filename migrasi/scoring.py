@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+from migrasi.clustering import describe_clusters
+from migrasi.features import derived_from_params, derived_inputs, derived_values, feature_name
+from migrasi.incremental import nearest_centroid
+from migrasi.preprocessing import CHUNK_SIZE
+from migrasi.store import load_run
+
+# Penilaian kelurahan baru terhadap model yang sudah di-fit, tanpa fit ulang:
+# setiap baris dinormalisasi dengan scaler yang sama (termasuk fitur turunan
+# dan PCA bila ada) lalu diberi cluster centroid terdekat. Jarak ke semua
+# centroid dihitung sekaligus per chunk, sehingga memori tetap
+# chunk_size x jumlah cluster berapa pun jumlah barisnya.
+CLUSTER_COL = 'cluster'
+KETERANGAN_COL = 'keterangan'
+MARGIN_COL = 'margin'
+MISSING_LABEL = -1
+
+
+class CentroidScorer:
+    # columns: kolom fitur saat fit (urutan sama dengan masukan scaler),
+    # derived: spesifikasi fitur turunan yang termasuk dalam columns
+
+    def __init__(self, scaler, kmeans, columns, derived=()):
+        self.scaler = scaler
+        self.columns = list(columns)
+        self.derived = [spec for spec in derived if feature_name(spec) in self.columns]
+        derived_names = [feature_name(spec) for spec in self.derived]
+        self.base_columns = [col for col in self.columns if col not in derived_names]
+        self.input_columns = list(dict.fromkeys([*self.base_columns, *derived_inputs(self.derived)]))
+        self._base_positions = [self.columns.index(col) for col in self.base_columns]
+        self._derived_positions = [self.columns.index(name) for name in derived_names]
+
+        self.centers = np.asarray(kmeans.cluster_centers_, dtype=np.float64)
+        # Keterangan per cluster sama dengan hasil clustering (dua fitur pertama, skala asli)
+        centroids_denorm = scaler.inverse_transform(self.centers)
+        self.keterangan = describe_clusters(centroids_denorm[:, :2], kmeans.labels_)
+
+    @classmethod
+    def from_run(cls, run_id):
+        run = load_run(run_id)
+        if run is None:
+            raise ValueError(f"Run {run_id} tidak ditemukan di penyimpanan model.")
+        params = run['params']
+        derived = derived_from_params((params.get('features') or {}).get('derived'))
+        return cls(run['scaler'], run['kmeans'], params['columns'], derived)
+
+    def missing_columns(self, columns):
+        return [col for col in self.input_columns if col not in columns]
+
+    def _features(self, chunk):
+        X = np.empty((len(chunk), len(self.columns)), dtype=np.float64)
+        X[:, self._base_positions] = chunk[self.base_columns].to_numpy(dtype=np.float64)
+        if self.derived:
+            X[:, self._derived_positions] = derived_values(chunk, self.derived)
+        return X
+
+    def score(self, df, chunk_size=CHUNK_SIZE):
+        # Kembalikan frame cluster, keterangan, dan margin (selisih jarak ke
+        # centroid kedua dan terdekat; kecil berarti dekat batas cluster) dengan
+        # index yang sama seperti df. Baris dengan nilai kosong diberi cluster -1.
+        missing = self.missing_columns(df.columns)
+        if missing:
+            raise ValueError(f"Kolom tidak ditemukan: {', '.join(map(str, missing))}")
+        labels = np.full(len(df), MISSING_LABEL, dtype=np.int32)
+        margins = np.full(len(df), np.nan)
+        for start in range(0, len(df), chunk_size):
+            X = self._features(df.iloc[start:start + chunk_size])
+            valid = np.isfinite(X).all(axis=1)
+            if valid.any():
+                rows = np.flatnonzero(valid) + start
+                labels[rows], margins[rows] = nearest_centroid(self.scaler.transform(X[valid]), self.centers)
+        keterangan = np.where(labels >= 0, self.keterangan[np.maximum(labels, 0)], None)
+        return pd.DataFrame({CLUSTER_COL: labels, KETERANGAN_COL: keterangan, MARGIN_COL: margins}, index=df.index)
+
+
+def score_frame(df, scaler, kmeans, columns, derived=(), chunk_size=CHUNK_SIZE):
+    # df ditambah kolom cluster, keterangan, dan margin (kolom lama bernama sama diganti)
+    scores = CentroidScorer(scaler, kmeans, columns, derived).score(df, chunk_size)
+    return df.assign(**{col: scores[col] for col in scores.columns})
+
+
+def score_csv(input_path, output_path, run_id, chunk_size=CHUNK_SIZE):
+    # Mode batch: file dibaca dan ditulis per chunk, jadi jutaan baris tidak
+    # pernah dimuat utuh. Mengembalikan jumlah baris per cluster.
+    scorer = CentroidScorer.from_run(run_id)
+    counts = {}
+    header = True
+    for chunk in pd.read_csv(input_path, chunksize=chunk_size):
+        scores = scorer.score(chunk, chunk_size)
+        chunk.assign(**{col: scores[col] for col in scores.columns}).to_csv(
+            output_path, mode='w' if header else 'a', header=header, index=False
+        )
+        header = False
+        for label, count in zip(*np.unique(scores[CLUSTER_COL], return_counts=True)):
+            counts[int(label)] = counts.get(int(label), 0) + int(count)
+    if header:
+        pd.DataFrame(columns=[*scorer.input_columns, CLUSTER_COL, KETERANGAN_COL, MARGIN_COL]).to_csv(
+            output_path, index=False
+        )
+    return counts
@@ -0,0 +1,197 @@
+import copy
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from migrasi.paths import BASE_DIR
+
+# Penyimpanan hasil clustering di disk. Setiap run disimpan di
+# STORE_DIR/<run_id>/ dengan run_id = hash isi data + parameter, sehingga
+# analisis ulang atas data yang sama cukup membaca file, tanpa fit ulang.
+# Frame data disimpan sekali per isi di STORE_DIR/.data/ (dipakai bersama
+# oleh semua run atas data yang sama, tanpa kolom cluster/keterangan) dan
+# label sekali per run di labels.npy (margin per baris hasil pembaruan
+# inkremental, bila ada, di margins.npy). Run tertua dihapus bila jumlahnya
+# melebihi MAX_RUNS.
+STORE_DIR = os.environ.get('MIGRASI_STORE_DIR', os.path.join(BASE_DIR, 'model_store'))
+DATA_DIR = os.path.join(STORE_DIR, '.data')
+MAX_RUNS = int(os.environ.get('MIGRASI_STORE_MAX_RUNS', 50))
+
+MODEL_FILE = 'model.joblib'
+LABELS_FILE = 'labels.npy'
+MARGINS_FILE = 'margins.npy'
+DATA_FILE = 'data.pkl'
+PARAMS_FILE = 'params.json'
+LABEL_COLUMNS = ('cluster', 'keterangan')
+
+
+def make_run_id(data_hash, columns, num_clusters, engine):
+    key = json.dumps([data_hash, list(columns), int(num_clusters), engine])
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def _run_dir(run_id):
+    return os.path.join(STORE_DIR, run_id)
+
+
+def _data_key(df):
+    h = hashlib.sha1(json.dumps([str(col) for col in df.columns]).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _save_data(df):
+    # Frame yang sama (mis. run dengan k atau engine berbeda) hanya ditulis sekali
+    key = _data_key(df)
+    path = os.path.join(DATA_DIR, f'{key}.pkl')
+    if not os.path.exists(path):
+        os.makedirs(DATA_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=DATA_DIR, prefix='.tmp-')
+        os.close(fd)
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+    return key
+
+
+def _cluster_keterangan(df, labels, n_clusters):
+    # Keterangan per cluster (bukan per baris) untuk membangun ulang kolom keterangan
+    if 'keterangan' not in df.columns:
+        return None
+    per_cluster = pd.Series(df['keterangan'].to_numpy()).groupby(labels).first()
+    return [per_cluster.get(cluster) for cluster in range(n_clusters)]
+
+
+def save_run(run_id, scaler, kmeans, df, params):
+    # Tulis ke direktori sementara lalu rename agar run tidak pernah setengah jadi
+    if os.path.isdir(_run_dir(run_id)):
+        return run_id
+    os.makedirs(STORE_DIR, exist_ok=True)
+    labels = np.asarray(kmeans.labels_)
+    # Label hanya disimpan di labels.npy, tidak ikut di model maupun frame
+    model = copy.copy(kmeans)
+    del model.labels_
+    # Margin per baris (pembaruan inkremental) juga disimpan terpisah dari model
+    margins = getattr(model, 'margins_', None)
+    if margins is not None:
+        model.margins_ = None
+    tmp_dir = tempfile.mkdtemp(dir=STORE_DIR, prefix='.tmp-')
+    try:
+        data_key = _save_data(df.drop(columns=[col for col in LABEL_COLUMNS if col in df.columns]))
+        joblib.dump({'scaler': scaler, 'kmeans': model}, os.path.join(tmp_dir, MODEL_FILE))
+        np.save(os.path.join(tmp_dir, LABELS_FILE), labels)
+        if margins is not None:
+            np.save(os.path.join(tmp_dir, MARGINS_FILE), margins)
+        params = dict(
+            params,
+            run_id=run_id,
+            created_at=time.strftime('%Y-%m-%d %H:%M:%S'),
+            n_rows=len(df),
+            centroids=np.asarray(kmeans.cluster_centers_).tolist(),
+            data_key=data_key,
+            keterangan=_cluster_keterangan(df, labels, len(kmeans.cluster_centers_)),
+        )
+        with open(os.path.join(tmp_dir, PARAMS_FILE), 'w') as f:
+            json.dump(params, f, indent=2)
+        os.rename(tmp_dir, _run_dir(run_id))
+    except OSError:
+        # Run lain dengan id yang sama sudah selesai lebih dulu
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not os.path.isdir(_run_dir(run_id)):
+            raise
+    prune_runs(keep=run_id)
+    return run_id
+
+
+def prune_runs(max_runs=MAX_RUNS, keep=None):
+    # Hapus run tertua di atas batas, lalu frame data yang tidak lagi dipakai run mana pun
+    runs = list_runs()
+    for params in runs[max_runs:]:
+        if params['run_id'] != keep:
+            shutil.rmtree(_run_dir(params['run_id']), ignore_errors=True)
+    used = {params.get('data_key') for params in list_runs()}
+    if os.path.isdir(DATA_DIR):
+        for name in os.listdir(DATA_DIR):
+            key, ext = os.path.splitext(name)
+            if ext == '.pkl' and key not in used:
+                try:
+                    os.remove(os.path.join(DATA_DIR, name))
+                except FileNotFoundError:
+                    pass
+
+
+def load_params(run_id):
+    try:
+        with open(os.path.join(_run_dir(run_id), PARAMS_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def load_run(run_id, with_data=False):
+    params = load_params(run_id)
+    if params is None:
+        return None
+    run_dir = _run_dir(run_id)
+    try:
+        run = joblib.load(os.path.join(run_dir, MODEL_FILE))
+        run['labels'] = np.load(os.path.join(run_dir, LABELS_FILE))
+        run['kmeans'].labels_ = run['labels']
+        margins_path = os.path.join(run_dir, MARGINS_FILE)
+        if os.path.exists(margins_path):
+            run['kmeans'].margins_ = np.load(margins_path)
+        run['params'] = params
+        if with_data:
+            run['df'] = _load_data(run_dir, params, run['labels'])
+    except FileNotFoundError:
+        # Run dihapus (prune_runs) setelah params-nya terbaca
+        return None
+    return run
+
+
+def _load_data(run_dir, params, labels):
+    if params.get('data_key') is None:
+        # Format lama: frame lengkap disimpan di direktori run
+        return pd.read_pickle(os.path.join(run_dir, DATA_FILE))
+    df = pd.read_pickle(os.path.join(DATA_DIR, f"{params['data_key']}.pkl"))
+    df['cluster'] = labels
+    if params.get('keterangan') is not None:
+        df['keterangan'] = np.asarray(params['keterangan'], dtype=object)[labels]
+    return df
+
+
+def list_runs():
+    if not os.path.isdir(STORE_DIR):
+        return []
+    runs = [load_params(run_id) for run_id in os.listdir(STORE_DIR) if not run_id.startswith('.')]
+    return sorted((p for p in runs if p is not None), key=lambda p: p['created_at'], reverse=True)
+
+
+# Hasil pemilihan k otomatis bergantung hanya pada data, jadi disimpan
+# terpisah dari run: STORE_DIR/.k_selection/<data_hash>.json
+K_SELECTION_DIR = os.path.join(STORE_DIR, '.k_selection')
+
+
+def save_k_selection(data_hash, selection):
+    os.makedirs(K_SELECTION_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=K_SELECTION_DIR, prefix='.tmp-')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(selection, f, indent=2)
+    os.replace(tmp_path, os.path.join(K_SELECTION_DIR, f'{data_hash}.json'))
+
+
+def load_k_selection(data_hash):
+    try:
+        with open(os.path.join(K_SELECTION_DIR, f'{data_hash}.json')) as f:
+            selection = json.load(f)
+    except FileNotFoundError:
+        return None
+    # Kunci dict JSON selalu string; kembalikan ke int
+    selection['inertias'] = {int(k): v for k, v in selection['inertias'].items()}
+    return selection
@@ -0,0 +1,29 @@
+import importlib
+import sys
+
+from migrasi.instrumentation import timed
+
+# Setiap halaman menu adalah modul tersendiri dengan fungsi render(). Modul
+# halaman (beserta pandas, scikit-learn, matplotlib, dan plotly yang
+# dibutuhkannya) baru diimpor saat halaman itu pertama kali dibuka, sehingga
+# halaman yang tidak aktif tidak menambah waktu start maupun waktu rerun.
+PAGES = {
+    "Home": 'home',
+    "Deskripsi": 'deskripsi',
+    "Unggah Data": 'unggah',
+    "Preprocessing": 'preprocessing',
+    "Clustering": 'clustering',
+    "Clustering Wilayah": 'wilayah',
+    "Visualisasi": 'visualisasi',
+    "Download Hasil": 'download',
+    "Diagnostik": 'diagnostik',
+}
+
+
+def load_page(menu):
+    name = f"{__name__}.{PAGES[menu]}"
+    module = sys.modules.get(name)
+    if module is None:
+        with timed(f"import:{PAGES[menu]}"):
+            module = importlib.import_module(name)
+    return module
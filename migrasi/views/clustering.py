@@ -0,0 +1,260 @@
+import matplotlib.pyplot as plt
+import pandas as pd
+import streamlit as st
+
+from migrasi.clustering import (
+    ENGINE_AUTO, ENGINE_EXACT, ENGINE_MINIBATCH, K_RANGE, MINIBATCH_THRESHOLD_ROWS,
+    array_hash, describe_clusters, elbow_sweep, fit_kmeans, resolve_engine, select_k,
+)
+from migrasi.export import FORMAT_CSV, export_bytes, export_file_name
+from migrasi.incremental import MODE_ADD, MODE_REPLACE, update_clustering
+from migrasi.instrumentation import timed
+from migrasi.preprocessing import frame_hash, pca_components
+from migrasi.scoring import CentroidScorer
+from migrasi.store import load_k_selection, load_run, make_run_id, save_k_selection, save_run
+from migrasi.views.common import run_job, show_preview
+
+
+# Job clustering dijalankan di latar belakang (migrasi.jobs). Registry job
+# yang sudah selesai sekaligus menjadi cache per proses, dengan kunci hash
+# X_normalized dan parameter job.
+def elbow_job(X_normalized, k_range, engine):
+    def run(progress, cancel_event):
+        with timed('KMeans.fit (elbow)'):
+            return elbow_sweep(X_normalized, k_range, engine, progress=progress, cancel_event=cancel_event)
+    return run
+
+def k_selection_job(data_hash, X_normalized):
+    # Hasil pemilihan k otomatis juga disimpan ke disk per hash data
+    def run(progress, cancel_event):
+        selection = load_k_selection(data_hash)
+        if selection is None:
+            with timed('select_k'):
+                selection = select_k(X_normalized, progress=progress, cancel_event=cancel_event)
+            save_k_selection(data_hash, selection)
+        return selection
+    return run
+
+def fit_job(X_normalized, num_clusters, engine):
+    def run(progress, cancel_event):
+        with timed('KMeans.fit'):
+            return fit_kmeans(X_normalized, num_clusters, engine, cancel_event)
+    return run
+
+ENGINE_LABELS = {
+    ENGINE_AUTO: f"Otomatis (mini-batch di atas {MINIBATCH_THRESHOLD_ROWS:,} baris)",
+    ENGINE_EXACT: "Exact (KMeans)",
+    ENGINE_MINIBATCH: "Mini-batch (KMeans per chunk)",
+}
+
+# Halaman Clustering
+def render():
+    st.header("Clustering")
+    if st.session_state['X_normalized'] is not None:
+        X_normalized = st.session_state['X_normalized']
+
+        # Pilih engine clustering
+        engine = st.selectbox(
+            "Engine clustering:", list(ENGINE_LABELS), format_func=ENGINE_LABELS.get
+        )
+        engine = resolve_engine(engine, len(X_normalized))
+        st.caption(f"Engine yang digunakan: {ENGINE_LABELS[engine]}")
+
+        # Elbow Method (diisi setelah model dimuat dari penyimpanan atau di-fit)
+        elbow_container = st.container()
+
+        # Slider untuk memilih jumlah cluster
+        st.subheader("Pilih Jumlah Cluster")
+        auto_k = st.toggle(
+            "Pilih jumlah cluster otomatis (silhouette, Davies-Bouldin, knee)",
+            value=st.session_state.get('auto_k', False)
+        )
+        st.session_state['auto_k'] = auto_k
+        st.session_state.setdefault('num_clusters_slider', st.session_state['num_clusters'] or 3)
+        k_selection = None
+        if auto_k:
+            k_selection = run_job(
+                'select_k', ('select_k', st.session_state['X_hash']),
+                k_selection_job(st.session_state['X_hash'], X_normalized), "Mencari jumlah cluster terbaik"
+            )
+
+            # Slider diatur ke rekomendasi satu kali per dataset, lalu bebas diubah
+            if st.session_state.get('k_recommendation_for') != st.session_state['X_hash']:
+                st.session_state['num_clusters_slider'] = k_selection['k']
+                st.session_state['k_recommendation_for'] = st.session_state['X_hash']
+            st.write(
+                f"Rekomendasi: **k = {k_selection['k']}** "
+                f"(sampel {k_selection['sample_size']:,} dari {len(X_normalized):,} baris)"
+            )
+            st.dataframe(pd.DataFrame(k_selection['metrics']).set_index('k'), use_container_width=True)
+        num_clusters = st.slider("Jumlah Cluster:", 2, 10, key='num_clusters_slider')
+
+        df = st.session_state['df']
+        kelurahan_col = st.session_state.get('kelurahan_col', 'nama_desa_kelurahan')
+        data_hash, columns = st.session_state['preprocess_key']
+        run_id = make_run_id(data_hash, columns, num_clusters, engine)
+        k_range = tuple(K_RANGE)
+
+        # Pakai hasil tersimpan bila data dan parameter sama pernah di-cluster
+        stored_run = load_run(run_id)
+        if stored_run is not None:
+            kmeans = stored_run['kmeans']
+            inertias = stored_run['params']['inertias']
+            st.caption(f"Hasil dimuat dari penyimpanan model (run {run_id[:12]}).")
+        elif k_selection is not None:
+            # Mode otomatis: kurva elbow dari sampel, hanya k terpilih yang di-fit penuh
+            inertias = [k_selection['inertias'][k] for k in k_range]
+            elbow_models = {}
+            st.caption(f"Kurva Elbow dihitung pada sampel {k_selection['sample_size']:,} baris.")
+        else:
+            elbow_models = run_job(
+                'elbow', ('elbow', st.session_state['X_hash'], k_range, engine),
+                elbow_job(X_normalized, k_range, engine), "Menghitung Elbow Method"
+            )
+            inertias = [elbow_models[k].inertia_ for k in k_range]
+
+        if stored_run is None:
+            # Jalankan K-Means (pakai ulang model dari Elbow Method bila tersedia)
+            kmeans = elbow_models.get(num_clusters)
+            if kmeans is None:
+                kmeans = run_job(
+                    'fit', ('fit', st.session_state['X_hash'], num_clusters, engine),
+                    fit_job(X_normalized, num_clusters, engine), "Menjalankan K-Means"
+                )
+        df['cluster'] = kmeans.labels_
+        centroids_denorm = st.session_state['scaler'].inverse_transform(kmeans.cluster_centers_)
+        # Keterangan tetap berdasarkan total migrasi masuk + keluar (dua fitur pertama)
+        df['keterangan'] = describe_clusters(centroids_denorm[:, :2], kmeans.labels_)[kmeans.labels_]
+
+        if stored_run is None:
+            stored_columns = [col for col in dict.fromkeys([kelurahan_col, *columns, 'cluster', 'keterangan']) if col in df.columns]
+            save_run(run_id, st.session_state['scaler'], kmeans, df[stored_columns], {
+                'columns': list(columns),
+                'kelurahan_col': kelurahan_col,
+                'num_clusters': num_clusters,
+                'engine': engine,
+                'inertias': inertias,
+                'k_selection': k_selection,
+                'features': st.session_state.get('feature_spec'),
+            })
+
+        with elbow_container:
+            st.subheader("Elbow Method")
+            if inertias is None:
+                st.info("Kurva Elbow tidak tersedia untuk hasil pembaruan inkremental.")
+        if inertias is not None:
+            fig, ax = plt.subplots()
+            ax.plot(k_range, inertias, marker='o')
+            ax.set_xlabel("Jumlah Cluster (k)")
+            ax.set_ylabel("Inertia")
+            ax.set_title("Elbow Method")
+            with elbow_container, timed('st.pyplot'):
+                st.pyplot(fig)
+            plt.close(fig)
+
+        # Simpan hasil ke session_state
+        st.session_state['df'] = df
+        st.session_state['kmeans'] = kmeans
+        st.session_state['num_clusters'] = num_clusters
+        st.session_state['run_id'] = run_id
+
+        st.write("Hasil Clustering:")
+        show_preview(df, key='preview_clustering')
+
+        # Pembaruan inkremental: centroid saat ini menjadi titik awal dan hanya
+        # kelurahan baru/berubah (dan yang dekat batas cluster) yang dihitung
+        # ulang. Margin per baris ikut disimpan di model, jadi lintasan atas
+        # semua baris hanya terjadi pada pembaruan pertama setelah fit penuh.
+        with st.expander("Perbarui dengan Data Periode Baru"):
+            if len(columns) > 2 or pca_components(st.session_state['scaler']) is not None:
+                st.info("Pembaruan inkremental hanya tersedia untuk clustering dengan dua fitur migrasi masuk dan keluar tanpa PCA.")
+            else:
+                st.markdown(f"""
+                Unggah data periode baru dengan kolom **{kelurahan_col}**, **{columns[0]}**, dan **{columns[1]}**.
+                Kelurahan yang sudah ada diperbarui, kelurahan baru ditambahkan, lalu cluster disesuaikan mulai dari centroid saat ini.
+                """)
+                update_file = st.file_uploader("Unggah data periode baru (.csv)", type="csv", key='update_file')
+                update_mode = st.radio(
+                    "Cara menggabungkan data:", [MODE_ADD, MODE_REPLACE], horizontal=True,
+                    format_func={MODE_ADD: "Tambahkan ke total lama", MODE_REPLACE: "Ganti nilai lama"}.get
+                )
+                if update_file and st.button("Perbarui clustering"):
+                    try:
+                        update_df = pd.read_csv(update_file, usecols=[kelurahan_col, *columns])
+                    except ValueError:
+                        st.error("File periode baru tidak memiliki kolom yang sesuai.")
+                        st.stop()
+                    with timed('update_clustering'):
+                        combined, X_updated, updated_kmeans, report, stats = update_clustering(
+                            df, update_df, kelurahan_col, list(columns), st.session_state['scaler'], kmeans, update_mode,
+                            X_previous=st.session_state['X_normalized'],
+                        )
+                    updated_key = (frame_hash(combined, columns), tuple(columns))
+                    updated_run_id = make_run_id(updated_key[0], columns, num_clusters, engine)
+                    save_run(updated_run_id, st.session_state['scaler'], updated_kmeans, combined, {
+                        'columns': list(columns),
+                        'kelurahan_col': kelurahan_col,
+                        'num_clusters': num_clusters,
+                        'engine': engine,
+                        'inertias': None,
+                        'parent_run': run_id,
+                        'incremental': stats,
+                    })
+                    st.session_state['df'] = combined
+                    st.session_state['X_normalized'] = X_updated
+                    st.session_state['X_hash'] = array_hash(X_updated)
+                    st.session_state['preprocess_key'] = updated_key
+                    st.session_state['kmeans'] = updated_kmeans
+                    st.session_state['run_id'] = updated_run_id
+                    st.session_state['incremental_report'] = (report, stats)
+                    st.rerun()
+
+                if st.session_state.get('incremental_report') is not None:
+                    report, stats = st.session_state['incremental_report']
+                    st.write(
+                        f"Pembaruan terakhir: {stats['changed']:,} kelurahan berubah, {stats['added']:,} kelurahan baru, "
+                        f"jarak dihitung untuk {stats.get('initial', 0):,} baris pada lintasan awal dan "
+                        f"{stats['recomputed']:,} baris lagi dalam {stats['n_iter']} iterasi."
+                    )
+                    if stats['out_of_range']:
+                        st.caption(f"{stats['out_of_range']:,} baris berada di luar rentang normalisasi awal.")
+                    st.write(f"Kelurahan yang berpindah cluster atau berubah keterangan ({len(report):,}):")
+                    st.dataframe(report, use_container_width=True)
+
+        # Scoring: kelurahan baru/terkoreksi diberi cluster centroid terdekat
+        # dari model saat ini tanpa mengubah model maupun data clustering
+        with st.expander("Tentukan Cluster Data Baru"):
+            scorer = CentroidScorer(
+                st.session_state['scaler'], kmeans, columns,
+                (st.session_state.get('feature_spec') or {}).get('derived', ())
+            )
+            st.markdown(f"""
+            Unggah data dengan kolom **{'**, **'.join(map(str, scorer.input_columns))}**.
+            Setiap baris diberi cluster dengan centroid terdekat dari model saat ini.
+            """)
+            score_file = st.file_uploader("Unggah data baru (.csv)", type="csv", key='score_file')
+            if score_file:
+                score_key = (score_file.file_id, run_id)
+                if st.session_state.get('scored_key') != score_key:
+                    new_df = pd.read_csv(score_file)
+                    missing = scorer.missing_columns(new_df.columns)
+                    if missing:
+                        st.error(f"File tidak memiliki kolom: {', '.join(map(str, missing))}")
+                        st.stop()
+                    with timed('score_frame'):
+                        scores = scorer.score(new_df)
+                    st.session_state['scored'] = new_df.assign(**{col: scores[col] for col in scores.columns})
+                    st.session_state['scored_key'] = score_key
+                scored = st.session_state['scored']
+                unassigned = int((scored['cluster'] < 0).sum())
+                if unassigned:
+                    st.caption(f"{unassigned:,} baris memiliki nilai kosong dan tidak diberi cluster (-1).")
+                show_preview(scored, key='preview_scoring')
+                st.download_button(
+                    "Download Hasil Scoring", data=lambda: export_bytes(scored, FORMAT_CSV),
+                    file_name=export_file_name(FORMAT_CSV, "hasil_scoring"), mime='text/csv',
+                    on_click='ignore'
+                )
+    else:
+        st.warning("Harap lakukan preprocessing terlebih dahulu di menu 'Preprocessing'.")
+        st.stop()
@@ -0,0 +1,58 @@
+import pandas as pd
+import streamlit as st
+
+from migrasi.jobs import release, submit, subscribe
+
+
+@st.fragment(run_every=1)
+def show_job_progress(job):
+    # Hanya bagian ini yang di-rerun tiap detik; halaman penuh di-rerun saat job selesai
+    if job.done():
+        st.rerun()
+    st.progress(job.progress, text=f"{job.label}... {job.progress:.0%}")
+
+def run_job(kind, key, func, label):
+    # Satu job aktif per jenis per sesi. Bila parameter berubah, job lama
+    # dilepas (dan dibatalkan bila tidak ada sesi lain yang menunggunya).
+    active = st.session_state.setdefault('jobs', {})
+    previous = active.get(kind)
+    if previous is not None and previous.key != key:
+        release(previous)
+        del active[kind]
+
+    if st.session_state.get('cancelled_job') == key:
+        st.warning(f"{label} dibatalkan.")
+        if st.button("Jalankan lagi", key=f'retry_{kind}'):
+            st.session_state['cancelled_job'] = None
+            st.rerun()
+        st.stop()
+
+    job = submit(key, func, label)
+    if active.get(kind) is not job:
+        subscribe(job)
+        active[kind] = job
+    if job.succeeded():
+        return job.result()
+    if job.failed():
+        st.error(f"{label} gagal: {job.future.exception()}")
+        st.stop()
+
+    show_job_progress(job)
+    if st.button("Batalkan", key=f'cancel_{kind}'):
+        release(job)
+        del active[kind]
+        st.session_state['cancelled_job'] = key
+        st.rerun()
+    st.stop()
+
+# Pratinjau data per halaman agar tabel besar tidak dikirim utuh ke browser
+PREVIEW_ROWS = 100
+
+def show_preview(data, key, columns=None):
+    num_pages = max(1, -(-len(data) // PREVIEW_ROWS))
+    page = st.number_input(f"Halaman (1 - {num_pages})", min_value=1, max_value=num_pages, value=1, key=key)
+    start = (page - 1) * PREVIEW_ROWS
+    if columns is None:
+        st.write(data.iloc[start:start + PREVIEW_ROWS])
+    else:
+        st.write(pd.DataFrame(data[start:start + PREVIEW_ROWS], columns=columns))
@@ -0,0 +1,15 @@
+import streamlit as st
+
+
+# Halaman Deskripsi
+def render():
+    st.header("Deskripsi Aplikasi")
+    st.markdown("""
+    Aplikasi ini digunakan untuk melakukan analisis clustering pada data migrasi.
+    Anda dapat melakukan :
+    - Unggah dataset migrasi (.csv). Harap unggah dataset yang sudah bersih, lengkap, dan siap diolah.
+    - Melakukan preprocessing data (normalisasi).
+    - Menentukan jumlah cluster menggunakan Elbow Method.
+    - Melihat hasil clustering melalui visualisasi interaktif.
+    - Mendownload hasil clustering dalam format CSV.
+    """)
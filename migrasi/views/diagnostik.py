@@ -0,0 +1,41 @@
+import os
+
+import pandas as pd
+import streamlit as st
+
+from migrasi.instrumentation import histogram, profile_summary, request_profile, summary
+
+
+# Halaman Diagnostik (tersembunyi, hanya bila MIGRASI_DIAGNOSTICS=1)
+def render():
+    st.header("Diagnostik Performa")
+    st.markdown("""
+    Latensi per halaman dan per tahap, dikumpulkan dari semua sesi sejak server dijalankan.
+    """)
+    stats = summary()
+    if stats:
+        st.dataframe(pd.DataFrame(stats), use_container_width=True)
+        stage = st.selectbox("Histogram latensi untuk tahap:", [row['tahap'] for row in stats])
+        counts, edges = histogram(stage)
+        st.bar_chart(pd.DataFrame({'jumlah': counts}, index=[f"{edge:.1f}" for edge in edges[:-1]]))
+        st.caption("Sumbu x: batas bawah bin latensi (ms).")
+    else:
+        st.info("Belum ada data. Buka halaman lain terlebih dahulu.")
+
+    st.subheader("Profil Satu Rerun")
+    st.markdown(
+        "Rerun berikutnya (mis. setelah membuka halaman lain) akan diprofil dengan cProfile "
+        "dan puncak memorinya diukur dengan tracemalloc."
+    )
+    if st.button("Profil rerun berikutnya"):
+        request_profile(st.session_state)
+    profile_path = st.session_state.get('_diagnostics_last_profile')
+    if profile_path and os.path.exists(profile_path):
+        st.write(f"Profil terakhir: `{profile_path}` (format pstats, bisa dibuka dengan snakeviz atau flameprof)")
+        peak = st.session_state.get('_diagnostics_last_peak')
+        if peak is not None:
+            st.write(f"Puncak memori selama rerun tersebut: {peak / 2**20:,.1f} MB")
+            st.caption("Diukur untuk seluruh proses, termasuk sesi dan job lain yang berjalan bersamaan.")
+        st.text(profile_summary(profile_path))
+        with open(profile_path, 'rb') as f:
+            st.download_button("Download profil (.prof)", f.read(), file_name=os.path.basename(profile_path))
@@ -0,0 +1,29 @@
+import streamlit as st
+
+from migrasi.export import FORMATS, available_formats, excel_engine, export_bytes, export_file_name
+
+
+# Halaman Download
+def render():
+    st.header("Download Hasil Clustering")
+    if st.session_state['df'] is not None:
+        df = st.session_state['df']
+
+        # Kunci cache ekspor: run clustering + hasil clustering wilayah (bila ada)
+        run_id = '-'.join(filter(None, [st.session_state['run_id'], st.session_state['hierarchy_id']])) or None
+
+        # File dibuat saat tombol diklik (per chunk), lalu disimpan per run_id + format
+        export_format = st.selectbox(
+            "Format file:", available_formats(len(df)), format_func=lambda fmt: FORMATS[fmt][0]
+        )
+        if excel_engine() is None:
+            st.caption("Format Excel membutuhkan paket openpyxl atau xlsxwriter.")
+        st.download_button(
+            label="Download Hasil Clustering",
+            data=lambda: export_bytes(df, export_format, run_id),
+            file_name=export_file_name(export_format),
+            mime=FORMATS[export_format][1],
+            on_click='ignore',
+        )
+    else:
+        st.warning("Harap lakukan clustering terlebih dahulu di menu 'Clustering'.")
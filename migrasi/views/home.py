@@ -0,0 +1,181 @@
+import plotly.express as px
+import streamlit as st
+
+from migrasi.data import load_cluster_output, load_dataset, load_dataset_index, load_image
+from migrasi.figures import cached_render, render_diverging_bar, render_heatmap, render_pie
+from migrasi.instrumentation import timed
+from migrasi.large_data import downsample_rows
+
+
+# Halaman Home
+def render():
+    # Dataset dimuat saat halaman ini pertama kali dibuka (cache per proses)
+    dfmgr = load_dataset()
+    X = load_cluster_output()
+
+    st.header("Migrasi Penduduk Kota Bekasi Tahun 2022 - 2023")
+
+    st.image(load_image(), use_container_width=True)
+    
+    st.subheader("Pengertian Migrasi")
+    st.markdown("""
+    Migrasi adalah perpindahan penduduk dari satu wilayah ke wilayah lain dengan tujuan menetap. 
+    Terdapat dua jenis migrasi utama, yaitu :
+    - **Migrasi Masuk (In-migration)** : Penduduk pindah ke suatu wilayah.
+    - **Migrasi Keluar (Out-migration)** : Penduduk pindah keluar dari suatu wilayah.
+    
+    Dalam konteks Kota Bekasi, migrasi dapat memberikan wawasan tentang dinamika kependudukan, seperti pertumbuhan populasi, tekanan sosial, dan kebutuhan infrastruktur.
+    """)
+
+    # Indeks kelurahan dibangun sekali per versi dataset
+    dfmgr_index = load_dataset_index()
+
+    st.subheader("Pilih Kelurahan untuk Melihat Data")
+    if dfmgr_index is not None and dfmgr_index.names:
+        col1, col2 = st.columns([1, 3])
+
+        with col1:
+            kelurahan_pilihan = st.selectbox(
+                "Pilih kelurahan :",
+                options=dfmgr_index.names,
+                index=0
+            )
+
+        with col2:
+            data_kelurahan = dfmgr_index.rows(kelurahan_pilihan)
+            st.write(f"Data Migrasi untuk Kelurahan: **{kelurahan_pilihan}**")
+            st.write(data_kelurahan)
+    
+            # Heatmap dirender sekali per kelurahan dan versi dataset
+            heatmap_png = cached_render(
+                ('heatmap', dfmgr_index.version, kelurahan_pilihan),
+                lambda: render_heatmap(data_kelurahan, kelurahan_pilihan)
+            )
+            st.image(heatmap_png, use_container_width=True)
+    else:
+        st.error("Dataset migrasi tidak ditemukan.")
+    
+    st.subheader("Dataset Migrasi Kota Bekasi (2022 - 2023)")
+    st.write(dfmgr)
+
+    if dfmgr is not None:  
+        if dfmgr_index is None:
+            st.error("Dataset tidak memiliki kolom yang sesuai. Harap periksa dataset Anda.")
+
+        # Memastikan data numerik
+        elif not (dfmgr['total_migrasi_masuk'].dtype in ['int64', 'float64'] and 
+                dfmgr['total_migrasi_keluar'].dtype in ['int64', 'float64']):
+            st.error("Data heatmap harus numerik. Harap periksa dataset Anda.")
+        else:
+            st.subheader("Migrasi Masuk dan Keluar per Kelurahan Kota Bekasi (2022 - 2023)")
+
+            # Urutan berdasarkan total migrasi masuk sudah dihitung di indeks
+            dfmgr_sorted = dfmgr_index.sorted_by('total_migrasi_masuk')
+
+            # Bar chart dirender sekali per versi dataset
+            bar_png = cached_render(
+                ('bar', dfmgr_index.version),
+                lambda: render_diverging_bar(dfmgr_sorted)
+            )
+            st.image(bar_png, use_container_width=True)
+
+            st.markdown("""
+            Grafik diatas menunjukkan **distribusi migrasi masuk dan keluar** di berbagai wilayah kelurahan **Kota Bekasi** selama **2022-2023**. 
+            Warna ungu tua dan ungu muda mencerminkan perkembangan jumlah migrasi, dengan **warna ungu tua** menunjukkan **angka migrasi masuk** sedangkan **warna ungu muda** menunjukkan **angka migrasi keluar**. 
+            Sebagian besar wilayah memiliki migrasi masuk dan keluar yang seimbang, namun beberapa wilayah, seperti Kaliabang Tengah, menunjukkan migrasi keluar yang sangat tinggi. 
+            Perbedaan pola migrasi ini memberikan wawasan penting untuk perencanaan kota, terutama dalam penyediaan fasilitas publik dan analisis ketimpangan antarwilayah.
+            """) 
+       
+    st.text("")  
+
+    col1, col2 = st.columns(2)
+    with col1:    
+            st.subheader("Proporsi Migrasi Kota Bekasi (2022 - 2023)")
+            totals = dfmgr_index.totals()
+            total_masuk = totals['total_migrasi_masuk']
+            total_keluar = totals['total_migrasi_keluar']
+            pie_png = cached_render(
+                ('pie', dfmgr_index.version),
+                lambda: render_pie(total_masuk, total_keluar)
+            )
+            st.image(pie_png, use_container_width=True)
+    with col2:
+            st.text("")
+            st.text("")
+            st.text("")
+            st.text("")
+            st.text("")
+            st.text("")
+            st.markdown("""
+            Grafik di samping menunjukkan proporsi antara **migrasi masuk** dan **migrasi keluar** di **Kota Bekasi** periode tahun **2022 - 2023**. 
+            Terlihat bahwa migrasi keluar mendominasi dengan persentase sebesar **53.8%**, sedangkan migrasi masuk mencakup **46.2%** dari total migrasi. 
+            Data ini menggambarkan bahwa jumlah penduduk yang keluar dari wilayah di Kota Bekasi **lebih besar** dibandingkan dengan jumlah yang masuk. 
+            Informasi ini penting untuk **mengidentifikasi pola migrasi** dan **memahami dinamika kependudukan** di wilayah Kota Bekasi.
+            """)      
+
+    st.subheader("Cluster Data Migrasi Kota Bekasi (2022 - 2023)")
+    st.write(X)
+
+    # Transformasi dataset agar sesuai untuk visualisasi (di-downsample bila terlalu banyak titik)
+    X_melted = downsample_rows(X).melt(
+        id_vars=['Kelurahan', 'cluster', 'keterangan'],  
+        value_vars=['Migrasi_Masuk', 'Migrasi_Keluar'],  
+        var_name='Jenis Migrasi',  
+        value_name='Jumlah Migrasi'  
+    )
+
+    # Membuat area chart dengan Plotly
+    with timed('px.area'):
+        fig_area = px.area(
+            X_melted,  
+            x='Kelurahan',  
+            y='Jumlah Migrasi',  
+            color='Jenis Migrasi',  
+            hover_data={  
+                'Kelurahan': True,
+                'Jumlah Migrasi': ':,',  
+                'Jenis Migrasi': False,  
+                'cluster': True,  
+                'keterangan': True  
+            },
+            labels={
+                'Jumlah Migrasi': 'Jumlah Migrasi',
+                'Jenis Migrasi': 'Jenis Migrasi',
+                'Kelurahan': 'Kelurahan'
+            },
+        )
+
+    # Kustomisasi tampilan
+    fig_area.update_layout(
+        title={
+            'text': "",
+            'x': 0.5,  
+            'xanchor': 'center',
+            'yanchor': 'top'
+        },
+        xaxis_title="Kelurahan",
+        yaxis_title="Jumlah Migrasi",
+        legend_title="Jenis Migrasi",
+        font=dict(family="Arial, sans-serif", size=12),
+        plot_bgcolor="#f9f9f9",  
+        hovermode="x unified",  
+        margin=dict(l=40, r=40, t=40, b=40) 
+    )
+
+    # Tambahkan grid agar lebih mudah dibaca
+    fig_area.update_xaxes(showgrid=True, gridcolor="#eaeaea")
+    fig_area.update_yaxes(showgrid=True, gridcolor="#eaeaea")
+
+    # Menampilkan visualisasi di Streamlit
+    with timed('st.plotly_chart'):
+        st.plotly_chart(fig_area, use_container_width=True)
+
+    st.markdown("""
+            Berdasarkan hasil analisis cluster terhadap data migrasi **Kota Bekasi** tahun **2022-2023**, terdapat pembagian wilayah ke dalam dua cluster utama, yaitu cluster 0 dengan keterangan **"Penurunan"** dan cluster 1 dengan keterangan **"Peningkatan"**. 
+            Wilayah dengan cluster **"Peningkatan"** memiliki angka migrasi keluar yang lebih **tinggi** dibandingkan migrasi masuk, seperti **Bekasijaya** yang memiliki migrasi masuk sebanyak 5.989 orang tetapi migrasi keluar mencapai 7.336 orang. 
+            Hal ini mencerminkan adanya kecenderungan **peningkatan** perpindahan penduduk ke luar wilayah.
+            
+            Sebaliknya, wilayah dengan cluster **"Penurunan"** menunjukkan angka migrasi masuk yang lebih **rendah** dibandingkan migrasi keluar (angka migrasi keluar suatu wilayah lebih rendah dari wilayah lain), 
+            misalnya **Kranji** dengan migrasi keluar sebanyak 5.157 orang terlihat **menurun** dari angka migrasi keluar **Bintara** sebanyak 6.112 orang. 
+            Fenomena ini mengindikasikan adanya kecenderungan **berkurangnya** arus migrasi penduduk di wilayah tersebut.
+            """)
@@ -0,0 +1,124 @@
+import streamlit as st
+
+from migrasi.clustering import array_hash
+from migrasi.features import (
+    DERIVED_DELTA, DERIVED_NET, DERIVED_RATE, add_features, numeric_columns,
+    share_specs, year_series, yoy_specs,
+)
+from migrasi.hierarchy import CLUSTER_COL, GLOBAL_CLUSTER_COL
+from migrasi.instrumentation import timed
+from migrasi.preprocessing import feature_pipeline, frame_hash, normalize_minmax, preprocess_hash, reduce_pca
+from migrasi.views.common import show_preview
+
+
+# Halaman Preprocessing
+def render():
+    st.header("Preprocessing Data")
+    
+    # Cek apakah dataset sudah diunggah
+    if 'df' in st.session_state and st.session_state['df'] is not None:
+        df = st.session_state['df']
+
+        # Ambil nama kolom migrasi masuk dan keluar dari session_state
+        migrasi_masuk_col = st.session_state.get('migrasi_masuk_col')
+        migrasi_keluar_col = st.session_state.get('migrasi_keluar_col')
+
+        if migrasi_masuk_col and migrasi_keluar_col:
+            # Pilihan fitur: kolom masuk/keluar selalu dua fitur pertama,
+            # ditambah kolom numerik lain dan fitur turunan bila dipilih
+            st.subheader("Fitur Clustering")
+            base_columns = [migrasi_masuk_col, migrasi_keluar_col]
+            spec = st.session_state.get('feature_spec') or {}
+            numeric = [
+                col for col in numeric_columns(df)
+                if col not in base_columns and col not in ('cluster', CLUSTER_COL, GLOBAL_CLUSTER_COL)
+            ]
+            extra_columns = st.multiselect(
+                "Kolom numerik tambahan:", numeric,
+                default=[col for col in spec.get('extra', []) if col in numeric]
+            )
+            derived = []
+            if st.checkbox("Migrasi neto (masuk - keluar)", value=any(d[0] == DERIVED_NET for d in spec.get('derived', []))):
+                derived.append((DERIVED_NET, migrasi_masuk_col, migrasi_keluar_col))
+            population_options = [None] + numeric
+            population_col = st.selectbox(
+                "Kolom jumlah penduduk (laju migrasi per 1.000 penduduk):", population_options,
+                index=population_options.index(spec.get('population')) if spec.get('population') in population_options else 0,
+                format_func=lambda col: "Tidak dipakai" if col is None else col
+            )
+            if population_col is not None:
+                derived += [(DERIVED_RATE, col, population_col) for col in base_columns]
+            year_columns = [*base_columns, *extra_columns]
+            if year_series(year_columns) and st.checkbox(
+                "Selisih antar tahun (kolom bersufiks tahun)", value=spec.get('yoy', False)
+            ):
+                derived += yoy_specs(year_columns)
+            breakdown = st.multiselect(
+                "Kolom rincian (mis. jenis kelamin/kelompok umur) sebagai porsi:", numeric,
+                default=[col for col in spec.get('breakdown', []) if col in numeric]
+            )
+            derived += share_specs(breakdown)
+
+            # Fitur turunan dan hash-nya dihitung sekali per data dan pilihan fitur;
+            # rerun berikutnya memakai frame yang sama selama session df tidak diganti
+            feature_key = (st.session_state.get('ingest_key'), (*base_columns, *extra_columns), tuple(derived))
+            featured = st.session_state.get('featured')
+            if featured is None or featured['key'] != feature_key or featured['df'] is not df:
+                with timed('add_features'):
+                    df, columns = add_features(df, [*base_columns, *extra_columns], derived)
+                    featured = {'key': feature_key, 'df': df, 'columns': columns, 'hash': frame_hash(df, columns)}
+                st.session_state['featured'] = featured
+                st.session_state['df'] = df
+            df, columns = featured['df'], featured['columns']
+            n_components = None
+            if len(columns) > 2 and st.toggle("Reduksi dimensi dengan PCA sebelum K-Means", value=spec.get('pca') is not None):
+                n_components = 2
+                if len(columns) > 3:
+                    n_components = st.slider(
+                        "Jumlah komponen PCA:", 2, len(columns) - 1,
+                        value=min(spec.get('pca') or 2, len(columns) - 1)
+                    )
+            st.session_state['feature_spec'] = {
+                'extra': extra_columns,
+                'population': population_col,
+                'yoy': any(d[0] == DERIVED_DELTA for d in derived),
+                'breakdown': breakdown,
+                'derived': derived,
+                'pca': n_components,
+            }
+
+            # Normalisasi data, dihitung ulang hanya bila data, fitur, atau PCA berubah
+            preprocess_key = (preprocess_hash(df, columns, n_components, featured['hash']), tuple(columns))
+            if st.session_state.get('preprocess_key') != preprocess_key or st.session_state['X_normalized'] is None:
+                with timed('normalize_minmax'):
+                    scaler, X_normalized = normalize_minmax(df, columns)
+                if n_components is not None:
+                    with timed('reduce_pca'):
+                        pca, X_normalized = reduce_pca(X_normalized, n_components)
+                    scaler = feature_pipeline(scaler, pca)
+
+                # Simpan hasil normalisasi dan scaler ke session_state
+                st.session_state['scaler'] = scaler
+                st.session_state['X_normalized'] = X_normalized
+                st.session_state['X_hash'] = array_hash(X_normalized)
+                st.session_state['preprocess_key'] = preprocess_key
+                # Model lama dibuat untuk fitur sebelumnya, jalankan clustering ulang
+                st.session_state['kmeans'] = None
+                st.session_state['run_id'] = None
+            X_normalized = st.session_state['X_normalized']
+
+            # Tampilkan hasil normalisasi
+            if n_components is None:
+                st.write("Data setelah dinormalisasi:")
+                show_preview(X_normalized, key='preview_normalisasi', columns=columns)
+            else:
+                explained = st.session_state['scaler'].named_steps['pca'].explained_variance_ratio_
+                st.write(
+                    f"Data setelah dinormalisasi dan direduksi ke {n_components} komponen "
+                    f"({explained.sum():.1%} varians dari {len(columns)} fitur):"
+                )
+                show_preview(X_normalized, key='preview_normalisasi', columns=[f"PC{i + 1}" for i in range(n_components)])
+        else:
+            st.error("Harap pilih kolom migrasi masuk dan keluar terlebih dahulu di menu 'Unggah Data'.")
+    else:
+        st.warning("Harap unggah dataset terlebih dahulu di menu 'Unggah Data'.")
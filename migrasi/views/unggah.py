@@ -0,0 +1,143 @@
+import pandas as pd
+import streamlit as st
+
+from migrasi.clustering import array_hash
+from migrasi.columnar import cache_key, content_hash, open_columnar, save_columnar
+from migrasi.features import derived_from_params
+from migrasi.ingest import STREAMING_THRESHOLD_BYTES, compact_frame, read_columns_chunked, read_header
+from migrasi.instrumentation import timed
+from migrasi.preprocessing import pca_components, preprocess_hash
+from migrasi.store import list_runs, load_run
+from migrasi.views.common import show_preview
+
+
+# Halaman Unggah Data
+def render():
+    st.header("Unggah Dataset Migrasi")
+    st.markdown("""
+    Harap unggah dataset yang sudah bersih, lengkap, dan siap diolah.
+    """)
+    uploaded_file = st.file_uploader("Unggah file dataset (.csv)", type="csv")
+    # file_uploader menyimpan seluruh isi file di memori server; mode streaming
+    # hanya menghemat memori untuk data hasil baca, bukan untuk file unggahan.
+    st.caption(
+        f"File unggahan disimpan utuh di memori server (maks. {st.get_option('server.maxUploadSize')} MB). "
+        "Untuk file yang lebih besar, jalankan `python -m migrasi --engine minibatch file.csv` "
+        "yang membaca file langsung dari disk."
+    )
+
+    # Alternatif: muat hasil clustering yang pernah disimpan
+    stored_runs = list_runs()
+    if stored_runs and not uploaded_file:
+        with st.expander("Muat hasil clustering tersimpan"):
+            st.write(pd.DataFrame(stored_runs, columns=['run_id', 'created_at', 'n_rows', 'columns', 'num_clusters', 'engine']))
+            run_id = st.selectbox("Pilih run:", [run['run_id'] for run in stored_runs])
+            if st.button("Muat hasil"):
+                run = load_run(run_id, with_data=True)
+                if run is None:
+                    st.error("Run tidak ditemukan; mungkin sudah dihapus karena melebihi batas penyimpanan.")
+                    st.stop()
+                params = run['params']
+                df = run['df']
+                X_normalized = run['scaler'].transform(df[params['columns']].to_numpy()).astype('float32')
+                n_components = pca_components(run['scaler'])
+                st.session_state['df'] = df
+                st.session_state['featured'] = None
+                st.session_state['kelurahan_col'] = params['kelurahan_col']
+                st.session_state['migrasi_masuk_col'], st.session_state['migrasi_keluar_col'] = params['columns'][:2]
+                features = params.get('features') or {}
+                st.session_state['feature_spec'] = dict(features, derived=derived_from_params(features.get('derived')))
+                st.session_state['scaler'] = run['scaler']
+                st.session_state['kmeans'] = run['kmeans']
+                st.session_state['num_clusters'] = params['num_clusters']
+                st.session_state['run_id'] = run_id
+                st.session_state['X_normalized'] = X_normalized
+                st.session_state['X_hash'] = array_hash(X_normalized)
+                st.session_state['preprocess_key'] = (
+                    preprocess_hash(df, params['columns'], n_components), tuple(params['columns'])
+                )
+                st.success(f"Hasil clustering {run_id[:12]} berhasil dimuat.")
+
+    if uploaded_file:
+        # Mode streaming: file dibaca per chunk dan hanya kolom terpilih yang disimpan
+        streaming = st.toggle(
+            "Mode streaming (untuk file besar)",
+            value=uploaded_file.size > STREAMING_THRESHOLD_BYTES,
+        )
+        # Hash isi file dihitung sekali per unggahan; dipakai sebagai kunci cache kolumnar
+        if st.session_state.get('upload_id') != uploaded_file.file_id:
+            with st.spinner("Menghitung hash file..."):
+                st.session_state['upload_hash'] = content_hash(uploaded_file)
+            st.session_state['upload_id'] = uploaded_file.file_id
+        upload_hash = st.session_state['upload_hash']
+
+        if streaming:
+            columns = read_header(uploaded_file)
+        else:
+            # Seluruh file dikonversi sekali ke cache kolumnar, lalu dibuka memory-mapped
+            ingest_key = cache_key(upload_hash)
+            if st.session_state.get('ingest_key') != ingest_key:
+                df = open_columnar(ingest_key)
+                if df is None:
+                    with st.spinner("Mengonversi dataset ke format kolumnar..."), timed('pd.read_csv'):
+                        save_columnar(ingest_key, compact_frame(pd.read_csv(uploaded_file)))
+                    df = open_columnar(ingest_key)
+                st.session_state['df'] = df
+                st.session_state['ingest_key'] = ingest_key
+                st.session_state['run_id'] = None
+                st.session_state['hierarchy_id'] = None
+                st.session_state['featured'] = None
+            df = st.session_state['df']
+            columns = df.columns.tolist()
+
+        # Pilih kolom nama kelurahan, migrasi masuk dan keluar. Pada mode
+        # streaming pilihan kolom ada di dalam form: file baru dibaca setelah
+        # "Baca data" diklik, bukan setiap kali satu kolom diganti.
+        st.subheader("Pilih Kolom untuk Migrasi")
+        with st.form('kolom_migrasi') if streaming else st.container():
+            kelurahan_col = st.selectbox(
+                "Pilih kolom untuk nama kelurahan:", columns,
+                index=columns.index('nama_desa_kelurahan') if 'nama_desa_kelurahan' in columns else 0
+            )
+
+            migrasi_masuk_col = st.selectbox(
+                "Pilih kolom untuk total migrasi masuk:", columns
+            )
+
+            migrasi_keluar_col = st.selectbox(
+                "Pilih kolom untuk total migrasi keluar:", columns
+            )
+            submitted = streaming and st.form_submit_button("Baca data")
+
+        if streaming:
+            # Baca ulang hanya bila file atau pilihan kolom berubah dan belum ada di cache
+            ingest_key = cache_key(upload_hash, [kelurahan_col, migrasi_masuk_col, migrasi_keluar_col])
+            if st.session_state.get('ingest_key') != ingest_key:
+                df = open_columnar(ingest_key)
+                if df is None:
+                    if not submitted:
+                        st.info("Pilih kolom lalu klik 'Baca data' untuk membaca dataset.")
+                        st.stop()
+                    try:
+                        with st.spinner("Membaca dataset per chunk..."), timed('read_columns_chunked'):
+                            save_columnar(ingest_key, read_columns_chunked(
+                                uploaded_file, kelurahan_col, [migrasi_masuk_col, migrasi_keluar_col]
+                            ))
+                    except ValueError:
+                        st.error("Kolom migrasi masuk dan keluar harus berisi data numerik.")
+                        st.stop()
+                    df = open_columnar(ingest_key)
+                st.session_state['df'] = df
+                st.session_state['ingest_key'] = ingest_key
+                st.session_state['run_id'] = None
+                st.session_state['hierarchy_id'] = None
+                st.session_state['featured'] = None
+            df = st.session_state['df']
+
+        st.write(f"Dataset yang diunggah ({len(df):,} baris):")
+        show_preview(df, key='preview_unggah')
+
+        # Simpan pilihan kolom ke session_state
+        st.session_state['kelurahan_col'] = kelurahan_col
+        st.session_state['migrasi_masuk_col'] = migrasi_masuk_col
+        st.session_state['migrasi_keluar_col'] = migrasi_keluar_col
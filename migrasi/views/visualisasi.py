@@ -0,0 +1,158 @@
+import matplotlib.pyplot as plt
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from migrasi.features import project_2d
+from migrasi.instrumentation import timed
+from migrasi.large_data import (
+    SCATTERGL_THRESHOLD, TREEMAP_THRESHOLD, TREEMAP_TOP_N, scatter_figure, top_n_per_cluster,
+)
+from migrasi.preprocessing import pca_components
+
+
+# Halaman Visualisasi
+def render():
+    st.header("Visualisasi Clustering")
+    
+    # Cek apakah data, kmeans, dan scaler tersedia
+    if st.session_state['df'] is not None and st.session_state['kmeans'] is not None and st.session_state['scaler'] is not None:
+        df = st.session_state['df']
+        kmeans = st.session_state['kmeans']
+        scaler = st.session_state['scaler']
+
+        # Ambil nama kolom untuk migrasi masuk dan keluar dari session_state
+        migrasi_masuk_col = st.session_state.get('migrasi_masuk_col', 'Migrasi Masuk')
+        migrasi_keluar_col = st.session_state.get('migrasi_keluar_col', 'Migrasi Keluar')
+        kelurahan_col = st.session_state.get('kelurahan_col', 'nama_desa_kelurahan')
+
+        # Centroid (denormalisasi ke skala asli)
+        centroids_denorm = scaler.inverse_transform(kmeans.cluster_centers_)
+        feature_columns = list(st.session_state['preprocess_key'][1])
+
+        # Debugging: Menampilkan posisi centroid
+        st.write("Centroid Positions (denormalized):")
+        st.write(pd.DataFrame(centroids_denorm, columns=feature_columns))
+
+        # Dua fitur: sumbu migrasi masuk/keluar. Multi-fitur atau PCA: proyeksi ke dua komponen utama
+        n_components = pca_components(scaler)
+        if n_components is None and len(feature_columns) <= 2:
+            scatter_x, scatter_y = df[migrasi_masuk_col], df[migrasi_keluar_col]
+            scatter_centroids = centroids_denorm
+            x_label, y_label = migrasi_masuk_col, migrasi_keluar_col
+        else:
+            with timed('project_2d'):
+                points, scatter_centroids = project_2d(
+                    st.session_state['X_normalized'], kmeans.cluster_centers_, reduced=n_components is not None
+                )
+            scatter_x, scatter_y = points[:, 0], points[:, 1]
+            x_label, y_label = "Komponen utama 1", "Komponen utama 2"
+
+        # Scatter Plot
+        st.subheader("Scatter Plot Clustering")
+        if len(df) > SCATTERGL_THRESHOLD:
+            # Mode data besar: scatter WebGL, titik diagregasi ke grid di atas batas tertentu
+            st.caption("Mode data besar: scatter dirender dengan WebGL.")
+            scatter_fig = scatter_figure(
+                scatter_x, scatter_y, kmeans.labels_,
+                scatter_centroids, kmeans.n_clusters, x_label, y_label
+            )
+            with timed('st.plotly_chart'):
+                st.plotly_chart(scatter_fig, use_container_width=True)
+        else:
+            fig, ax = plt.subplots(figsize=(10, 5))
+
+            # Scatter plot untuk data cluster
+            scatter = ax.scatter(
+                scatter_x,
+                scatter_y,
+                c=kmeans.labels_,
+                cmap='rainbow',
+                alpha=0.7
+            )
+
+            # Loop untuk menampilkan semua centroid
+            for i, centroid in enumerate(scatter_centroids):
+                ax.scatter(
+                    centroid[0],  
+                    centroid[1],  
+                    marker='*',      
+                    s=200,           
+                    label=f'Centroid Cluster {i}',
+                    color=scatter.cmap(i / kmeans.n_clusters)
+                )
+
+            # Pengaturan sumbu dan legenda
+            ax.set_xlabel(x_label)
+            ax.set_ylabel(y_label)
+            ax.set_title("Scatter Plot Clustering")
+            ax.legend()
+            with timed('st.pyplot'):
+                st.pyplot(fig)
+            plt.close(fig)
+
+        # Area Chart Sebaran Cluster
+        st.subheader("Visualisasi Hasil Clustering Migrasi")
+        
+        # Pastikan kolom cluster berupa string
+        df['cluster'] = df['cluster'].astype(str)
+
+        # Mode data besar: hanya top-N kelurahan per cluster, sisanya digabung
+        treemap_df, treemap_values = df, None
+        if len(df) > TREEMAP_THRESHOLD:
+            st.caption(f"Mode data besar: menampilkan {TREEMAP_TOP_N} kelurahan teratas per cluster.")
+            treemap_df = top_n_per_cluster(df, kelurahan_col, [migrasi_masuk_col, migrasi_keluar_col])
+            treemap_values = 'jumlah'
+
+        with timed('px.treemap'):
+            treemap_fig = px.treemap(
+                treemap_df,
+                path=['cluster', kelurahan_col],  
+                values=treemap_values,
+                title='Kelurahan Berdasarkan Cluster',
+                color='cluster',
+                labels={
+                    'cluster': 'Cluster',
+                    kelurahan_col: 'Kelurahan'
+                },
+                color_discrete_map={
+                    '1': 'purple',        
+                    '2': 'mediumturquoise',  
+                    '3': 'pink'              
+                }
+            )
+        # Kustomisasi hovertemplate
+        treemap_fig.update_traces(
+            hovertemplate=(
+                "Kelurahan: %{label}<br>"  
+                "Cluster: %{parent}<br>"  
+                "Jumlah: %{value}<extra></extra>"  
+            )
+        )
+        # Tampilkan chart
+        with timed('st.plotly_chart'):
+            st.plotly_chart(treemap_fig)
+
+        df['cluster'] = df['cluster'].astype(str)
+        # Hitung jumlah kelurahan per cluster
+        cluster_counts = df['cluster'].value_counts().reset_index()
+        cluster_counts.columns = ['Cluster', 'Jumlah Kelurahan']
+
+        # Membuat Pie Chart
+        pie_fig = px.pie(
+            cluster_counts,
+            names='Cluster',
+            values='Jumlah Kelurahan',
+            title='Proporsi Tiap Cluster',
+            color='Cluster',
+            color_discrete_map={
+                '1': 'purple',         
+                '2': 'mediumturquoise',  
+                '3': 'pink'             
+            }
+        )
+        # Tampilkan chart
+        with timed('st.plotly_chart'):
+            st.plotly_chart(pie_fig)
+    else:
+        st.error("Data atau model belum tersedia. Silakan lakukan preprocessing dan clustering terlebih dahulu.")
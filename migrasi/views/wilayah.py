@@ -0,0 +1,109 @@
+import plotly.express as px
+import streamlit as st
+
+from migrasi.hierarchy import (
+    CLUSTER_COL, GLOBAL_CLUSTER_COL, GLOBAL_KETERANGAN_COL, KETERANGAN_COL,
+    assign_global, cluster_centroids, cluster_regions, partition_hash,
+)
+from migrasi.instrumentation import timed
+from migrasi.large_data import TREEMAP_THRESHOLD, TREEMAP_TOP_N, top_n_per_cluster
+from migrasi.views.common import run_job, show_preview
+
+
+def regions_job(data, region_col, columns, num_clusters):
+    def run(progress, cancel_event):
+        with timed('cluster_regions'):
+            return cluster_regions(
+                data, region_col, columns, num_clusters, progress=progress, cancel_event=cancel_event
+            )
+    return run
+
+# Halaman Clustering Wilayah (bertingkat: wilayah -> cluster -> kelurahan)
+def render():
+    st.header("Clustering Bertingkat per Wilayah")
+    st.markdown("""
+    Data dibagi per wilayah (mis. kota atau kecamatan), lalu kelurahan di setiap wilayah di-cluster
+    secara terpisah dan paralel. Opsional, centroid seluruh wilayah di-cluster lagi agar cluster
+    dapat dibandingkan antarwilayah.
+    """)
+    df = st.session_state['df']
+    migrasi_masuk_col = st.session_state.get('migrasi_masuk_col')
+    migrasi_keluar_col = st.session_state.get('migrasi_keluar_col')
+    if df is not None and migrasi_masuk_col and migrasi_keluar_col:
+        kelurahan_col = st.session_state.get('kelurahan_col', 'nama_desa_kelurahan')
+        # Pakai fitur hasil Preprocessing bila ada, selain itu migrasi masuk dan keluar
+        columns = [migrasi_masuk_col, migrasi_keluar_col]
+        if st.session_state.get('preprocess_key') and set(st.session_state['preprocess_key'][1]) <= set(df.columns):
+            columns = list(st.session_state['preprocess_key'][1])
+        result_columns = {'cluster', 'keterangan', CLUSTER_COL, KETERANGAN_COL, GLOBAL_CLUSTER_COL, GLOBAL_KETERANGAN_COL}
+        region_options = [col for col in df.columns if col not in {kelurahan_col, *columns, *result_columns}]
+
+        if not region_options:
+            st.warning("Dataset tidak memiliki kolom wilayah (mis. kota/kabupaten atau kecamatan).")
+        else:
+            default_region = next(
+                (i for i, col in enumerate(region_options) if any(name in str(col).lower() for name in ('kecamatan', 'kota', 'kab'))), 0
+            )
+            region_col = st.selectbox("Pilih kolom wilayah:", region_options, index=default_region)
+            num_clusters = st.slider("Jumlah cluster per wilayah:", 2, 10, value=3, key='region_clusters')
+            second_level = st.toggle("Clustering tingkat kedua atas centroid wilayah")
+            global_clusters = st.slider("Jumlah cluster global:", 2, 10, value=3, key='global_clusters') if second_level else None
+
+            data = df[[region_col, *columns]]
+            hierarchy_key = ('regions', partition_hash(data, region_col, columns), region_col, tuple(columns), num_clusters)
+            local, centroids = run_job(
+                'regions', hierarchy_key,
+                regions_job(data, region_col, columns, num_clusters), "Clustering per wilayah"
+            )
+            if second_level:
+                with timed('cluster_centroids'):
+                    centroids = cluster_centroids(centroids, region_col, columns, global_clusters)
+                    local = assign_global(data, region_col, local, centroids, columns)
+
+            stale = [col for col in (GLOBAL_CLUSTER_COL, GLOBAL_KETERANGAN_COL) if col in df.columns and col not in local.columns]
+            df = df.drop(columns=stale).assign(**{col: local[col].to_numpy() for col in local.columns})
+            st.session_state['df'] = df
+            st.session_state['hierarchy_id'] = f"{hierarchy_key[1]}-{num_clusters}-{global_clusters or 0}"
+
+            n_regions = centroids[region_col].nunique(dropna=False)
+            st.write(f"{len(df):,} kelurahan dalam {n_regions:,} wilayah.")
+            st.subheader("Centroid per Wilayah dan Cluster")
+            show_preview(centroids, key='preview_centroid_wilayah')
+            if second_level:
+                st.subheader("Cluster Global")
+                st.write(df.groupby([GLOBAL_CLUSTER_COL, GLOBAL_KETERANGAN_COL]).size().rename('Jumlah Kelurahan').reset_index())
+
+            # Treemap bertingkat: wilayah -> cluster -> kelurahan
+            st.subheader("Treemap Wilayah, Cluster, dan Kelurahan")
+            treemap_df, treemap_values = df[[region_col, CLUSTER_COL, kelurahan_col]].astype(str), None
+            if len(df) > TREEMAP_THRESHOLD:
+                st.caption(f"Mode data besar: menampilkan {TREEMAP_TOP_N} kelurahan teratas per cluster di setiap wilayah.")
+                treemap_df = top_n_per_cluster(
+                    df, kelurahan_col, [migrasi_masuk_col, migrasi_keluar_col], group_cols=[region_col, CLUSTER_COL]
+                )
+                treemap_values = 'jumlah'
+            with timed('px.treemap'):
+                treemap_fig = px.treemap(
+                    treemap_df,
+                    path=[region_col, CLUSTER_COL, kelurahan_col],
+                    values=treemap_values,
+                    title='Kelurahan Berdasarkan Wilayah dan Cluster',
+                    labels={
+                        region_col: 'Wilayah',
+                        CLUSTER_COL: 'Cluster',
+                        kelurahan_col: 'Kelurahan'
+                    },
+                )
+            treemap_fig.update_traces(
+                hovertemplate=(
+                    "%{label}<br>"
+                    "Induk: %{parent}<br>"
+                    "Jumlah: %{value}<extra></extra>"
+                )
+            )
+            st.plotly_chart(treemap_fig)
+
+            st.write("Hasil Clustering per Wilayah:")
+            show_preview(df, key='preview_clustering_wilayah')
+    else:
+        st.warning("Harap unggah dataset dan pilih kolom migrasi terlebih dahulu di menu 'Unggah Data'.")
@@ -0,0 +1,115 @@
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import numpy as np
+import pytest
+from sklearn.cluster import KMeans
+
+from migrasi import clustering
+from migrasi.data import KELUAR_COL, MASUK_COL, load_dataset
+from migrasi.preprocessing import normalize_minmax
+
+
+def _omp_threads():
+    return clustering._threadpools.select(user_api='openmp').info()[0]['num_threads']
+
+
+@pytest.fixture
+def budget(monkeypatch):
+    def set_budget(n):
+        monkeypatch.setattr(clustering, '_cores_total', n)
+    return set_budget
+
+
+def test_elbow_sweep_splits_core_budget(monkeypatch, budget):
+    # Setiap fit di thread pool mendapat jatah_core // max_workers thread OpenMP
+    seen = []
+
+    class RecordingKMeans(KMeans):
+        def fit(self, X, y=None, sample_weight=None):
+            seen.append(_omp_threads())
+            return super().fit(X, y, sample_weight)
+
+    monkeypatch.setattr(clustering, 'KMeans', RecordingKMeans)
+    budget(4)
+    X = np.random.default_rng(0).random((200, 2))
+    models = clustering.elbow_sweep(X, range(1, 5), max_workers=2)
+    assert list(models) == [1, 2, 3, 4]
+    assert seen == [2, 2, 2, 2]
+
+    seen.clear()
+    clustering.elbow_sweep(X, range(1, 4), max_workers=1)
+    assert seen == [4, 4, 4]
+
+
+def test_reserve_cores_caps_concurrent_threads(budget):
+    # Pemesanan dari banyak thread (mis. beberapa job sekaligus) tidak pernah melebihi jatah
+    budget(3)
+    lock = threading.Lock()
+    state = {'active': 0, 'peak': 0}
+
+    def work(n):
+        with clustering.reserve_cores(n) as granted:
+            with lock:
+                state['active'] += granted
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.01)
+            with lock:
+                state['active'] -= granted
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in [2, 1, 3, 2, 5, 1, 2]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert state['active'] == 0 and state['peak'] <= 3
+    assert clustering._cores_used == 0 and not clustering._cores_waiting
+
+
+def test_reserve_cores_cancelled_while_waiting(budget):
+    budget(1)
+    cancel_event = threading.Event()
+    cancel_event.set()
+    with clustering.reserve_cores(1):
+        with pytest.raises(CancelledError):
+            with clustering.reserve_cores(1, cancel_event):
+                pass
+    assert clustering._cores_used == 0 and not clustering._cores_waiting
+
+
+def test_select_k_on_bundled_dataset():
+    _, X = normalize_minmax(load_dataset(), [MASUK_COL, KELUAR_COL])
+    selection = clustering.select_k(X)
+    assert selection['k'] == 2
+    # 56 baris < SAMPLE_START: satu putaran dengan seluruh data
+    assert selection['rounds'] == [{'sample_size': len(X), 'k': 2}]
+    assert [m['k'] for m in selection['metrics']] == list(clustering.AUTO_K_RANGE)
+
+
+def test_score_k_needs_more_rows_than_max_k():
+    X = np.random.default_rng(0).random((10, 2))
+    with pytest.raises(ValueError, match='lebih dari 10 baris'):
+        clustering.score_k(X)
+
+
+@pytest.mark.filterwarnings('ignore::sklearn.exceptions.ConvergenceWarning')
+def test_uniform_data_has_no_recommendation():
+    with pytest.raises(ValueError, match='terlalu seragam'):
+        clustering.recommend_k([])
+    X = np.full((50, 2), 0.5, dtype=np.float32)
+    with pytest.raises(ValueError, match='terlalu seragam'):
+        clustering.select_k(X)
+
+
+def test_select_k_stops_when_two_rounds_agree():
+    # Tiga kelompok yang jelas: k sama pada dua putaran pertama, sampel tidak diperbesar lagi
+    rng = np.random.default_rng(0)
+    centers = np.array([[0.1, 0.1], [0.5, 0.9], [0.9, 0.2]])
+    X = (centers[rng.integers(0, 3, 20_000)] + rng.normal(0, 0.03, (20_000, 2))).astype(np.float32)
+    progress = []
+    selection = clustering.select_k(X, start=100, progress=progress.append)
+    assert selection['k'] == 3
+    assert selection['rounds'] == [{'sample_size': 100, 'k': 3}, {'sample_size': 200, 'k': 3}]
+    assert selection['sample_size'] == 200
+    assert progress == [100 / 20_000, 200 / 20_000]
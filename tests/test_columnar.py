@@ -0,0 +1,57 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from migrasi import columnar
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(columnar, 'CACHE_DIR', str(tmp_path))
+    return tmp_path
+
+
+def _frame(seed, n=10_000):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'kelurahan': pd.Categorical([f"kel_{i}" for i in rng.integers(0, 50, n)]),
+        'masuk': rng.integers(0, 9_000, n),
+        'keluar': rng.integers(0, 9_000, n),
+    })
+
+
+def _set_age(cache_dir, key, seconds_ago):
+    path = cache_dir / f'{key}{columnar.CACHE_SUFFIX}'
+    mtime = path.stat().st_mtime - seconds_ago
+    os.utime(path, (mtime, mtime))
+
+
+def test_round_trip(cache_dir):
+    df = _frame(0)
+    columnar.save_columnar('a', df)
+    pd.testing.assert_frame_equal(columnar.open_columnar('a'), df)
+    assert columnar.open_columnar('tidak_ada') is None
+
+
+def test_prune_removes_least_recently_opened(cache_dir, monkeypatch):
+    for i, key in enumerate(['a', 'b', 'c']):
+        columnar.save_columnar(key, _frame(i))
+        _set_age(cache_dir, key, 100 - i * 10)
+    size = (cache_dir / f'a{columnar.CACHE_SUFFIX}').stat().st_size
+
+    # 'a' dibuka lagi sehingga menjadi yang terbaru; 'b' yang paling lama tidak dipakai
+    columnar.open_columnar('a')
+    monkeypatch.setattr(columnar, 'MAX_CACHE_BYTES', int(size * 3.5))
+    columnar.save_columnar('d', _frame(3))
+    assert columnar.open_columnar('b') is None
+    assert all(columnar.open_columnar(key) is not None for key in ['a', 'c', 'd'])
+
+
+def test_prune_keeps_new_file_even_when_over_limit(cache_dir):
+    columnar.save_columnar('a', _frame(0))
+    _set_age(cache_dir, 'a', 100)
+    columnar.save_columnar('b', _frame(1))
+    columnar.prune_cache(max_bytes=0, keep='b')
+    assert sorted(os.listdir(cache_dir)) == [f'b{columnar.CACHE_SUFFIX}']
@@ -0,0 +1,114 @@
+import gzip
+import io
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from migrasi import export
+
+CHUNK_ROWS = 7
+XLSX_NS = {'x': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+
+
+def _frame(n=25):
+    # n bukan kelipatan CHUNK_ROWS agar chunk terakhir lebih pendek
+    rng = np.random.default_rng(0)
+    masuk = rng.integers(0, 8_000, n).astype(np.int16)
+    return pd.DataFrame({
+        'kelurahan': pd.Categorical([f"kel_{i}" for i in range(n)]),
+        'migrasi_masuk': masuk,
+        'rasio': np.where(masuk % 5 == 0, np.nan, masuk / 8_000),
+        'cluster': rng.integers(0, 3, n).astype(np.int32),
+        'keterangan': [f"Cluster {i % 3}" for i in range(n)],
+    })
+
+
+def _read(fmt, df):
+    with export.write_export(df, fmt, chunk_rows=CHUNK_ROWS) as sink:
+        return sink.read()
+
+
+def _xlsx_rows(data):
+    # Baca sheet1.xml langsung (tanpa openpyxl): nomor baris tiap sel menunjukkan posisi tiap chunk
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        root = ET.fromstring(archive.read('xl/worksheets/sheet1.xml'))
+    rows = {}
+    for row in root.iterfind('.//x:sheetData/x:row', XLSX_NS):
+        cells = {}
+        for cell in row.iterfind('x:c', XLSX_NS):
+            column = re.match(r'[A-Z]+', cell.get('r')).group()
+            text = cell.find('.//x:t', XLSX_NS) if cell.get('t') == 'inlineStr' else cell.find('x:v', XLSX_NS)
+            cells[column] = text.text
+        rows[int(row.get('r'))] = cells
+    return rows
+
+
+def test_csv_chunks_match_single_write():
+    df = _frame()
+    data = _read(export.FORMAT_CSV, df)
+    # Header hanya sekali, di awal
+    assert data.decode().count('kelurahan') == 1
+    assert data == df.to_csv(index=False).encode()
+
+
+def test_gzip_csv_decompresses_to_csv():
+    df = _frame()
+    data = _read(export.FORMAT_CSV_GZ, df)
+    assert data[:2] == b'\x1f\x8b'
+    assert gzip.decompress(data) == _read(export.FORMAT_CSV, df)
+
+
+def test_parquet_writes_one_row_group_per_chunk():
+    df = _frame()
+    parquet = pq.ParquetFile(io.BytesIO(_read(export.FORMAT_PARQUET, df)))
+    assert parquet.metadata.num_row_groups == 4
+    assert [parquet.metadata.row_group(i).num_rows for i in range(4)] == [7, 7, 7, 4]
+    pd.testing.assert_frame_equal(parquet.read().to_pandas(), df)
+
+
+def test_empty_frame_keeps_header_and_schema():
+    df = _frame().iloc[:0]
+    assert _read(export.FORMAT_CSV, df) == df.to_csv(index=False).encode()
+    table = pq.read_table(io.BytesIO(_read(export.FORMAT_PARQUET, df)))
+    assert table.num_rows == 0 and table.column_names == list(df.columns)
+
+
+def test_excel_chunks_are_written_below_each_other():
+    pytest.importorskip('xlsxwriter')
+    df = _frame()
+    rows = _xlsx_rows(_read(export.FORMAT_EXCEL, df))
+    # Baris 1 header, baris data 2..n+1 tanpa celah atau tumpang tindih antar chunk
+    assert sorted(rows) == list(range(1, len(df) + 2))
+    assert rows[1] == dict(zip('ABCDE', df.columns))
+    for i, record in enumerate(df.itertuples(index=False)):
+        cells = rows[i + 2]
+        assert cells['A'] == record.kelurahan
+        assert int(cells['B']) == record.migrasi_masuk
+        if np.isnan(record.rasio):
+            assert 'C' not in cells
+        else:
+            assert float(cells['C']) == pytest.approx(record.rasio)
+        assert int(cells['D']) == record.cluster
+        assert cells['E'] == record.keterangan
+
+
+def test_excel_row_limit(monkeypatch):
+    pytest.importorskip('xlsxwriter')
+    monkeypatch.setattr(export, 'EXCEL_MAX_ROWS', 10)
+    assert export.FORMAT_EXCEL not in export.available_formats(11)
+    with pytest.raises(ValueError, match='10 baris'):
+        export.write_export(_frame(), export.FORMAT_EXCEL)
+
+
+def test_export_bytes_reuses_cached_result(monkeypatch):
+    monkeypatch.setattr(export, '_cache', type(export._cache)())
+    df = _frame()
+    first = export.export_bytes(df, export.FORMAT_CSV, run_id='run')
+    # Frame berbeda dengan run_id sama tetap memakai hasil ekspor tersimpan
+    assert export.export_bytes(df.iloc[:3], export.FORMAT_CSV, run_id='run') == first
+    assert export.export_bytes(df.iloc[:3], export.FORMAT_CSV) != first
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+
+from migrasi import hierarchy
+from migrasi.clustering import ENGINE_EXACT
+
+
+def _regions(n_regions=6, rows=400, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'kota': np.repeat([f"kota_{i}" for i in range(n_regions)], rows),
+        'masuk': rng.integers(0, 10_000, n_regions * rows),
+        'keluar': rng.integers(0, 10_000, n_regions * rows),
+    }).sample(frac=1, random_state=seed)
+
+
+def test_parallel_cluster_regions_matches_sequential(monkeypatch):
+    # Jalur paralel (satu wilayah per batch, beberapa proses) harus sama dengan jobs=1
+    df = _regions()
+    sequential = hierarchy.cluster_regions(df, 'kota', ['masuk', 'keluar'], 3, ENGINE_EXACT, jobs=1)
+
+    batches = hierarchy._batches
+    monkeypatch.setattr(hierarchy, 'PARALLEL_MIN_ROWS', 0)
+    monkeypatch.setattr(hierarchy, '_batches', lambda partitions: batches(partitions, batch_rows=1))
+    parallel = hierarchy.cluster_regions(df, 'kota', ['masuk', 'keluar'], 3, ENGINE_EXACT, jobs=2)
+
+    pdt.assert_frame_equal(parallel[0], sequential[0])
+    pdt.assert_frame_equal(parallel[1], sequential[1])
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans
+
+from migrasi.clustering import RANDOM_STATE
+from migrasi.incremental import nearest_centroid, update_clustering, warm_start_update
+from migrasi.preprocessing import normalize_minmax
+
+
+def _blobs(rng, n, k=4):
+    centers = rng.uniform(0, 1, size=(k, 2))
+    return centers[rng.integers(0, k, n)] + rng.normal(0, 0.08, size=(n, 2))
+
+
+def _reference(X, centers):
+    return KMeans(n_clusters=len(centers), init=centers, n_init=1, tol=0, max_iter=300, algorithm='lloyd').fit(X)
+
+
+def _assert_same(model, reference):
+    np.testing.assert_array_equal(model.labels_, reference.labels_)
+    np.testing.assert_allclose(model.cluster_centers_, reference.cluster_centers_, atol=1e-9)
+    np.testing.assert_allclose(model.inertia_, reference.inertia_, rtol=1e-9)
+
+
+def test_nearest_centroid_matches_brute_force():
+    rng = np.random.default_rng(3)
+    X = rng.random((20_000, 3)).astype(np.float32)
+    centers = rng.random((5, 3))
+    distances = np.sqrt(((X[:, None, :].astype(np.float64) - centers[None]) ** 2).sum(axis=2))
+    labels, margins = nearest_centroid(X, centers, chunk_size=4096)
+    np.testing.assert_array_equal(labels, distances.argmin(axis=1))
+    ordered = np.sort(distances, axis=1)
+    np.testing.assert_allclose(margins, ordered[:, 1] - ordered[:, 0], atol=1e-12)
+
+
+def test_warm_start_update_matches_kmeans_from_old_centers():
+    # Hasil warm start harus sama dengan Lloyd penuh yang dimulai dari centroid lama
+    rng = np.random.default_rng(0)
+    X_old = _blobs(rng, 2_000)
+    old = KMeans(n_clusters=4, random_state=RANDOM_STATE, n_init=1).fit(X_old)
+
+    X = np.vstack([X_old, _blobs(rng, 300)])
+    dirty = np.concatenate([rng.choice(len(X_old), 200, replace=False), np.arange(len(X_old), len(X))])
+    X[dirty[:200]] += rng.normal(0, 0.2, size=(200, 2))
+    labels = np.concatenate([old.labels_, np.zeros(len(X) - len(X_old), dtype=np.int32)])
+
+    model, initial, recomputed = warm_start_update(X, labels, old.cluster_centers_, dirty)
+    _assert_same(model, _reference(X, old.cluster_centers_))
+    np.testing.assert_array_equal(model.predict(X), nearest_centroid(X, model.cluster_centers_)[0])
+    assert initial == len(X)
+    assert 0 <= recomputed <= model.n_iter_ * len(X)
+
+
+def test_stored_margins_limit_work_to_changed_rows():
+    # Dengan margins_ dari pembaruan sebelumnya, hanya baris berubah (dan baris
+    # dekat batas) yang dihitung, tetapi hasilnya tetap sama dengan Lloyd penuh
+    rng = np.random.default_rng(1)
+    X = _blobs(rng, 20_000)
+    old = KMeans(n_clusters=4, random_state=RANDOM_STATE, n_init=1).fit(X)
+    first, _, _ = warm_start_update(X, old.labels_, old.cluster_centers_, np.arange(0))
+    assert first.margins_.dtype == np.float32 and len(first.margins_) == len(X)
+
+    for _ in range(3):
+        dirty = rng.choice(len(X), 20, replace=False)
+        X[dirty] = rng.random((20, 2))
+        reference = _reference(X, first.cluster_centers_)
+        model, initial, recomputed = warm_start_update(
+            X, first.labels_, first.cluster_centers_, dirty, first.margins_
+        )
+        _assert_same(model, reference)
+        assert len(dirty) <= initial < len(X) // 10
+        assert recomputed < len(X) // 10
+        # Margin tersimpan tetap batas bawah margin sebenarnya terhadap centroid baru
+        _, true_margins = nearest_centroid(X, model.cluster_centers_)
+        assert (model.margins_ <= true_margins).all()
+        first = model
+
+
+def test_update_clustering_reuses_previous_matrix():
+    rng = np.random.default_rng(2)
+    previous = pd.DataFrame({
+        'kelurahan': [f"kel_{i}" for i in range(3_000)],
+        'masuk': rng.integers(0, 9_000, 3_000),
+        'keluar': rng.integers(0, 9_000, 3_000),
+    })
+    scaler, X_previous = normalize_minmax(previous, ['masuk', 'keluar'])
+    kmeans = KMeans(n_clusters=3, random_state=RANDOM_STATE).fit(X_previous)
+    update = pd.DataFrame({
+        'kelurahan': ['kel_5', 'kel_17', 'baru_1', 'baru_2'],
+        'masuk': [100, 8_000, 4_000, 12_000],
+        'keluar': [50, 9_500, 10, 3_000],
+    })
+
+    full = update_clustering(previous, update, 'kelurahan', ['masuk', 'keluar'], scaler, kmeans)
+    reused = update_clustering(
+        previous, update, 'kelurahan', ['masuk', 'keluar'], scaler, kmeans, X_previous=X_previous
+    )
+    np.testing.assert_array_equal(reused[1], full[1])
+    np.testing.assert_array_equal(reused[2].labels_, full[2].labels_)
+    assert full[4]['changed'] == 2 and full[4]['added'] == 2
+
+    # Pembaruan berikutnya memakai margin dari model hasil pembaruan pertama
+    combined, X_updated, model = reused[0], reused[1], reused[2]
+    second = update_clustering(
+        combined.drop(columns=['cluster', 'keterangan']), update.assign(masuk=update['masuk'] + 1),
+        'kelurahan', ['masuk', 'keluar'], scaler, model, X_previous=X_updated,
+    )
+    assert second[4]['initial'] < len(combined) // 10
+    _assert_same(second[2], _reference(second[1].astype(np.float64), model.cluster_centers_))
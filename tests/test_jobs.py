@@ -0,0 +1,26 @@
+import numpy as np
+from sklearn.cluster import KMeans
+
+from migrasi import clustering, jobs
+
+
+def test_concurrent_jobs_share_core_budget(monkeypatch):
+    # Beberapa job elbow sweep sekaligus tidak boleh memakai lebih dari jatah core proses
+    used = []
+
+    class RecordingKMeans(KMeans):
+        def fit(self, X, y=None, sample_weight=None):
+            used.append(clustering._cores_used)
+            return super().fit(X, y, sample_weight)
+
+    monkeypatch.setattr(clustering, 'KMeans', RecordingKMeans)
+    monkeypatch.setattr(clustering, '_cores_total', 2)
+    X = np.random.default_rng(0).random((5_000, 2))
+
+    def sweep(progress, cancel_event):
+        return clustering.elbow_sweep(X, range(1, 5), progress=progress, cancel_event=cancel_event)
+
+    submitted = [jobs.submit(('test_core_budget', i), sweep) for i in range(3)]
+    results = [job.result() for job in submitted]
+    assert all(list(models) == [1, 2, 3, 4] for models in results)
+    assert len(used) == 12 and max(used) <= 2
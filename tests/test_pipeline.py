@@ -0,0 +1,69 @@
+import os
+
+import pandas as pd
+import pytest
+
+from migrasi.__main__ import main
+from migrasi.clustering import ENGINE_AUTO, ENGINE_MINIBATCH
+from migrasi.pipeline import output_paths, run_many
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INPUT = os.path.join(ROOT, 'migrasi_kota_bekasi.csv')
+REFERENCE = os.path.join(ROOT, 'output_cluster.csv')
+
+
+def test_cli_matches_reference_output(tmp_path, capsys):
+    # Keterangan per kelurahan dari CLI harus sama dengan output_cluster.csv
+    # (nomor cluster boleh berbeda, keterangannya tidak)
+    assert main([INPUT, '-o', str(tmp_path), '-k', '2', '-j', '1']) == 0
+    result = pd.read_csv(tmp_path / 'migrasi_kota_bekasi_cluster.csv')
+    reference = pd.read_csv(REFERENCE)
+
+    assert list(result.columns) == list(reference.columns)
+    pd.testing.assert_series_equal(result['Kelurahan'], reference['Kelurahan'])
+    pd.testing.assert_series_equal(result['keterangan'], reference['keterangan'])
+    assert 'migrasi_kota_bekasi_cluster.csv' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('engine', [ENGINE_AUTO, ENGINE_MINIBATCH])
+def test_run_many_parallel_matches_sequential(tmp_path, engine):
+    # Pekerja paralel (dengan batas thread BLAS/OpenMP) memberi hasil yang sama dengan jobs=1
+    inputs = []
+    for name in ('a', 'b'):
+        path = tmp_path / f'{name}.csv'
+        path.write_bytes(open(INPUT, 'rb').read())
+        inputs.append(str(path))
+    sequential = run_many(inputs, str(tmp_path / 'seq'), jobs=1, num_clusters=2, engine=engine)
+    parallel = run_many(inputs, str(tmp_path / 'par'), jobs=2, num_clusters=2, engine=engine)
+
+    for expected, result in zip(sequential, parallel):
+        assert result['n_rows'] == expected['n_rows']
+        pd.testing.assert_frame_equal(pd.read_csv(result['output']), pd.read_csv(expected['output']))
+
+
+def test_same_file_name_in_different_directories(tmp_path):
+    # Satu file per kota dengan nama sama: keluaran diberi awalan nama direktori
+    inputs = []
+    for city in ('jakarta', 'bekasi'):
+        (tmp_path / city).mkdir()
+        path = tmp_path / city / 'migrasi.csv'
+        path.write_bytes(open(INPUT, 'rb').read())
+        inputs.append(str(path))
+    output_dir = tmp_path / 'out'
+    assert output_paths(inputs, str(output_dir)) == [
+        str(output_dir / 'jakarta_migrasi_cluster.csv'), str(output_dir / 'bekasi_migrasi_cluster.csv'),
+    ]
+    results = run_many(inputs, str(output_dir), jobs=1, num_clusters=2)
+    assert sorted(os.listdir(output_dir)) == ['bekasi_migrasi_cluster.csv', 'jakarta_migrasi_cluster.csv']
+    assert [result['output'] for result in results] == output_paths(inputs, str(output_dir))
+
+
+def test_duplicate_outputs_are_rejected(tmp_path, capsys):
+    with pytest.raises(ValueError, match='migrasi_kota_bekasi_cluster.csv'):
+        run_many([INPUT, INPUT], str(tmp_path), jobs=1)
+    assert not os.listdir(tmp_path)
+
+    with pytest.raises(SystemExit) as excinfo:
+        main([INPUT, INPUT, '-o', str(tmp_path)])
+    assert excinfo.value.code == 2
+    assert 'file keluaran yang sama' in capsys.readouterr().err
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from migrasi.clustering import ENGINE_EXACT, fit_kmeans
+from migrasi.features import DERIVED_RATE, add_features, share_specs, yoy_specs
+from migrasi.preprocessing import feature_pipeline, normalize_minmax, reduce_pca
+from migrasi.scoring import CLUSTER_COL, KETERANGAN_COL, MISSING_LABEL, CentroidScorer, score_frame
+
+BASE_COLUMNS = ['migrasi_masuk_2022', 'migrasi_keluar_2022']
+
+
+def _frame(n=1_500, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'kelurahan': [f"kel_{i}" for i in range(n)],
+        'migrasi_masuk_2021': rng.integers(0, 8_000, n),
+        'migrasi_masuk_2022': rng.integers(0, 8_000, n),
+        'migrasi_keluar_2022': rng.integers(0, 8_000, n),
+        'penduduk': rng.integers(1_000, 50_000, n),
+        'laki': rng.integers(0, 4_000, n),
+        'perempuan': rng.integers(0, 4_000, n),
+    })
+
+
+def _fit(df, derived, n_components):
+    # Alur yang sama dengan halaman Preprocessing dan Clustering
+    featured, columns = add_features(df, BASE_COLUMNS, derived)
+    scaler, X_normalized = normalize_minmax(featured, columns)
+    pca = None
+    if n_components:
+        pca, X_normalized = reduce_pca(X_normalized, n_components)
+    kmeans = fit_kmeans(X_normalized, 3, ENGINE_EXACT)
+    return feature_pipeline(scaler, pca), kmeans, columns
+
+
+DERIVED = [
+    (DERIVED_RATE, 'migrasi_masuk_2022', 'penduduk'),
+    *yoy_specs(['migrasi_masuk_2021', 'migrasi_masuk_2022']),
+    *share_specs(['laki', 'perempuan']),
+]
+
+
+@pytest.mark.parametrize('derived, n_components', [
+    ([], None),
+    (DERIVED, None),
+    (DERIVED, 3),
+])
+def test_scorer_reproduces_fit_labels(derived, n_components):
+    df = _frame()
+    scaler, kmeans, columns = _fit(df, derived, n_components)
+    scorer = CentroidScorer(scaler, kmeans, columns, derived)
+
+    # Fitur turunan dihitung ulang oleh scorer dari kolom asli, per chunk
+    scores = scorer.score(df, chunk_size=256)
+    np.testing.assert_array_equal(scores[CLUSTER_COL].to_numpy(), kmeans.labels_)
+    assert (scores[KETERANGAN_COL].to_numpy() == scorer.keterangan[kmeans.labels_]).all()
+
+    scored = score_frame(df, scaler, kmeans, columns, derived)
+    np.testing.assert_array_equal(scored[CLUSTER_COL].to_numpy(), kmeans.labels_)
+
+
+def test_scorer_marks_incomplete_rows_and_missing_columns():
+    df = _frame()
+    scaler, kmeans, columns = _fit(df, DERIVED, None)
+    scorer = CentroidScorer(scaler, kmeans, columns, DERIVED)
+
+    incomplete = df.astype({'penduduk': float})
+    incomplete.loc[5, 'penduduk'] = np.nan
+    labels = scorer.score(incomplete)[CLUSTER_COL].to_numpy()
+    assert labels[5] == MISSING_LABEL
+    np.testing.assert_array_equal(np.delete(labels, 5), np.delete(kmeans.labels_, 5))
+
+    with pytest.raises(ValueError, match='penduduk'):
+        scorer.score(df.drop(columns='penduduk'))
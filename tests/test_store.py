@@ -0,0 +1,144 @@
+import json
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.cluster import KMeans
+from sklearn.preprocessing import MinMaxScaler
+
+from migrasi import store
+from migrasi.clustering import RANDOM_STATE
+
+COLUMNS = ['migrasi_masuk', 'migrasi_keluar']
+
+
+@pytest.fixture(autouse=True)
+def store_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(store, 'STORE_DIR', str(tmp_path))
+    monkeypatch.setattr(store, 'DATA_DIR', str(tmp_path / '.data'))
+    monkeypatch.setattr(store, 'K_SELECTION_DIR', str(tmp_path / '.k_selection'))
+    return tmp_path
+
+
+def _frame(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'kelurahan': [f"kel_{i}" for i in range(n)],
+        'migrasi_masuk': rng.integers(0, 8_000, n),
+        'migrasi_keluar': rng.integers(0, 8_000, n),
+    })
+
+
+def _fit(df, k):
+    # Alur yang sama dengan halaman Clustering: frame disimpan dengan kolom cluster dan keterangan
+    scaler = MinMaxScaler().fit(df[COLUMNS].to_numpy())
+    kmeans = KMeans(n_clusters=k, random_state=RANDOM_STATE, n_init=1).fit(scaler.transform(df[COLUMNS].to_numpy()))
+    df = df.assign(
+        cluster=kmeans.labels_,
+        keterangan=np.array([f"Cluster {c}" for c in range(k)], dtype=object)[kmeans.labels_],
+    )
+    return scaler, kmeans, df
+
+
+def _save(df, k, created_at=None):
+    scaler, kmeans, df = _fit(df, k)
+    run_id = store.make_run_id(f"data-{df['migrasi_masuk'].sum()}", COLUMNS, k, 'exact')
+    store.save_run(run_id, scaler, kmeans, df, {'columns': COLUMNS, 'num_clusters': k})
+    if created_at is not None:
+        # created_at beresolusi detik; urutan run diatur eksplisit
+        path = os.path.join(store.STORE_DIR, run_id, store.PARAMS_FILE)
+        with open(path) as f:
+            params = json.load(f)
+        with open(path, 'w') as f:
+            json.dump(dict(params, created_at=created_at), f)
+    return run_id, kmeans, df
+
+
+def _data_files():
+    return sorted(os.listdir(store.DATA_DIR))
+
+
+def test_save_and_load_run_with_data():
+    run_id, kmeans, df = _save(_frame(), 3)
+    run = store.load_run(run_id, with_data=True)
+    np.testing.assert_array_equal(run['labels'], kmeans.labels_)
+    np.testing.assert_array_equal(run['kmeans'].labels_, kmeans.labels_)
+    np.testing.assert_allclose(run['kmeans'].cluster_centers_, kmeans.cluster_centers_)
+    assert run['params']['n_rows'] == len(df) and run['params']['num_clusters'] == 3
+    # Kolom cluster dan keterangan dibangun ulang dari label, tidak disimpan di frame bersama
+    pd.testing.assert_frame_equal(run['df'], df, check_dtype=False)
+    stored = pd.read_pickle(os.path.join(store.DATA_DIR, _data_files()[0]))
+    assert list(stored.columns) == ['kelurahan', 'migrasi_masuk', 'migrasi_keluar']
+    assert store.load_run('tidak-ada') is None
+
+
+def test_runs_on_same_data_share_one_data_file():
+    df = _frame()
+    _save(df, 2)
+    _save(df, 3)
+    assert len(store.list_runs()) == 2
+    assert len(_data_files()) == 1
+
+
+def test_margins_round_trip():
+    scaler, kmeans, df = _fit(_frame(), 3)
+    kmeans.margins_ = np.linspace(0, 1, len(df), dtype=np.float32)
+    store.save_run('run-margins', scaler, kmeans, df, {'columns': COLUMNS})
+    # Model milik pemanggil tidak diubah; margin tidak ikut di model.joblib
+    assert kmeans.margins_ is not None
+    assert joblib.load(os.path.join(store.STORE_DIR, 'run-margins', store.MODEL_FILE))['kmeans'].margins_ is None
+    run = store.load_run('run-margins')
+    np.testing.assert_array_equal(run['kmeans'].margins_, kmeans.margins_)
+
+
+def test_load_run_in_old_format():
+    # Format lama: frame lengkap di data.pkl, tanpa data_key maupun keterangan di params
+    scaler, kmeans, df = _fit(_frame(), 2)
+    run_dir = os.path.join(store.STORE_DIR, 'run-lama')
+    os.makedirs(run_dir)
+    joblib.dump({'scaler': scaler, 'kmeans': kmeans}, os.path.join(run_dir, store.MODEL_FILE))
+    np.save(os.path.join(run_dir, store.LABELS_FILE), kmeans.labels_)
+    df.to_pickle(os.path.join(run_dir, store.DATA_FILE))
+    with open(os.path.join(run_dir, store.PARAMS_FILE), 'w') as f:
+        json.dump({'run_id': 'run-lama', 'created_at': '2024-01-01 00:00:00', 'columns': COLUMNS}, f)
+
+    run = store.load_run('run-lama', with_data=True)
+    pd.testing.assert_frame_equal(run['df'], df)
+    np.testing.assert_array_equal(run['kmeans'].labels_, kmeans.labels_)
+    # Pruning tidak menyentuh run lama selama masih di dalam batas
+    store.prune_runs(max_runs=10)
+    assert os.path.exists(os.path.join(run_dir, store.DATA_FILE))
+
+
+def test_prune_keeps_data_still_referenced():
+    shared, other = _frame(seed=0), _frame(seed=1)
+    _save(shared, 2, created_at='2024-01-01 00:00:00')
+    other_run, _, _ = _save(other, 2, created_at='2024-01-02 00:00:00')
+    newest_run, _, _ = _save(shared, 3, created_at='2024-01-03 00:00:00')
+    assert len(_data_files()) == 2
+
+    # Run tertua dihapus, tetapi frame-nya masih dipakai run terbaru
+    store.prune_runs(max_runs=2)
+    assert [p['run_id'] for p in store.list_runs()] == [newest_run, other_run]
+    assert len(_data_files()) == 2
+    assert store.load_run(newest_run, with_data=True)['df'].shape[0] == len(shared)
+
+    # Frame yang tidak lagi dipakai run mana pun ikut dihapus
+    store.prune_runs(max_runs=1)
+    assert [p['run_id'] for p in store.list_runs()] == [newest_run]
+    assert len(_data_files()) == 1
+    assert store.load_run(newest_run, with_data=True) is not None
+
+
+def test_prune_never_removes_kept_run():
+    # Run yang baru disimpan (keep) tetap ada walau lebih tua dari batas
+    first, _, _ = _save(_frame(seed=0), 2, created_at='2024-01-01 00:00:00')
+    second, _, _ = _save(_frame(seed=1), 2, created_at='2024-01-02 00:00:00')
+    store.prune_runs(max_runs=1, keep=first)
+    assert [p['run_id'] for p in store.list_runs()] == [second, first]
+    assert len(_data_files()) == 2
+    store.prune_runs(max_runs=1)
+    assert [p['run_id'] for p in store.list_runs()] == [second]
+    assert len(_data_files()) == 1